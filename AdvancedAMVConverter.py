@@ -1,9 +1,14 @@
+import time
+
+STARTUP_TIME = time.perf_counter()
+
 import sys
 import os
-import subprocess
+import shutil
+import tempfile
 from pathlib import Path
 
-if sys.platform == 'win32':
+if sys.platform == 'win32' and '--startup-profile' not in sys.argv:
     import ctypes
     from ctypes import wintypes
     
@@ -15,157 +20,477 @@ if sys.platform == 'win32':
     if hWnd:
         user32.ShowWindow(hWnd, SW_HIDE)
 
-def get_resource_path(relative_path):
-    if getattr(sys, 'frozen', False):
-        base_path = sys._MEIPASS
-    else:
-        base_path = os.path.dirname(__file__)
-    
-    return os.path.join(base_path, relative_path)
+from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                            QHBoxLayout, QLabel, QPushButton, QComboBox, 
+                            QProgressBar, QTextEdit, QFileDialog, QListWidget, QListWidgetItem,
+                            QTabWidget, QRadioButton, QButtonGroup, QMessageBox, QGridLayout, QMenu,
+                            QDialog, QDoubleSpinBox, QCheckBox)
+from PyQt6.QtCore import (Qt, QThread, QObject, QEvent, QTimer, QRunnable, QThreadPool,
+                          QSize, QPoint, QRect, pyqtSignal)
+from PyQt6.QtGui import (QIcon, QPixmap, QAction, QDragEnterEvent, QDropEvent, QPainter,
+                         QImage, QColor)
+from collections import OrderedDict
 
-def get_ffmpeg_path():
-    if getattr(sys, 'frozen', False):
-        ffmpeg_path = get_resource_path('ffmpeg.exe')
-        ffprobe_path = get_resource_path('ffprobe.exe')
-    else:
-        ffmpeg_path = 'ffmpeg'
-        ffprobe_path = 'ffprobe'
-    
-    return ffmpeg_path, ffprobe_path
+from amv_common import get_resource_path, FPS_BLOCK_MAPPING
 
-FFMPEG_PATH, FFPROBE_PATH = get_ffmpeg_path()
+IMPORTS_DONE_TIME = time.perf_counter()
 
-def run_subprocess(cmd, **kwargs):
-    default_kwargs = {
-        'creationflags': subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-    }
-    default_kwargs.update(kwargs)
-    return subprocess.Popen(cmd, **default_kwargs)
+class StartupProfiler(QObject):
+    def __init__(self, start_time):
+        super().__init__()
+        self.start_time = start_time
+        self.last_time = start_time
+        self.phases = []
+        self.painted = False
+        
+    def mark(self, phase, timestamp=None):
+        now = timestamp if timestamp is not None else time.perf_counter()
+        self.phases.append((phase, now - self.last_time))
+        self.last_time = now
+        
+    def eventFilter(self, obj, event):
+        if not self.painted and event.type() == QEvent.Type.Paint:
+            self.painted = True
+            QTimer.singleShot(0, self.first_paint_done)
+        return False
+    
+    def first_paint_done(self):
+        self.mark("first paint")
+        QApplication.instance().removeEventFilter(self)
+        self.report()
+        
+    def report(self):
+        lines = ["Startup profile (time to first paint):"]
+        for phase, duration in self.phases:
+            lines.append(f"  {phase:<20}{duration * 1000:9.1f} ms")
+        lines.append(f"  {'total':<20}{(self.last_time - self.start_time) * 1000:9.1f} ms")
+        print("\n".join(lines), flush=True)
 
-def run_subprocess_simple(cmd, **kwargs):
-    default_kwargs = {
-        'creationflags': subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
-    }
-    default_kwargs.update(kwargs)
-    return subprocess.run(cmd, **default_kwargs)
-from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
-                            QHBoxLayout, QLabel, QPushButton, QComboBox, 
-                            QProgressBar, QTextEdit, QFileDialog, QListWidget,
-                            QTabWidget, QRadioButton, QButtonGroup, QMessageBox, QGridLayout, QMenu)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal
-from PyQt6.QtGui import QIcon, QPixmap, QAction, QDragEnterEvent, QDropEvent, QPainter
+class FfmpegCheckWorker(QThread):
+    check_finished = pyqtSignal(dict)
+    
+    def run(self):
+        from amv_core import check_ffmpeg
+        self.check_finished.emit(check_ffmpeg())
+
+class AsyncWorker(QThread):
+    def __init__(self):
+        super().__init__()
+        self.is_running = True
+        self.loop = None
+        self.task = None
+        
+    def run_coroutine(self, coroutine):
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        try:
+            self.task = self.loop.create_task(coroutine)
+            if not self.is_running:
+                self.task.cancel()
+            return self.loop.run_until_complete(self.task)
+        finally:
+            self.loop.close()
+    
+    def stop(self):
+        self.is_running = False
+        loop, task = self.loop, self.task
+        if loop is not None and task is not None and not loop.is_closed():
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass
 
-class BlackBarWorker(QThread):
+class CoreWorker(AsyncWorker):
     progress_updated = pyqtSignal(int)
     status_updated = pyqtSignal(str)
     conversion_finished = pyqtSignal(bool, str)
     
-    def __init__(self, input_files):
+    def __init__(self, input_files, policy='fifo'):
         super().__init__()
-        self.input_files = input_files
-        self.is_running = True
+        self.input_files = list(input_files)
+        self.policy = policy
+        self.queue = None
         
-    def detect_crop(self, input_file):
-        try:
-            cmd = [
-                FFMPEG_PATH, '-ss', '00:00:01', '-t', '5', '-i', str(input_file),
-                '-vf', 'cropdetect', '-an', '-f', 'null', '-'
-            ]
-            
-            process = run_subprocess(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True
-            )
-            
-            stdout, stderr = process.communicate()
-            
-            crop_lines = [line for line in stderr.split('\n') if 'crop=' in line]
-            if crop_lines:
-                last_line = crop_lines[-1]
-                crop_start = last_line.find('crop=') + 5
-                crop_end = last_line.find(' ', crop_start)
-                if crop_end == -1:
-                    crop_end = len(last_line)
-                crop_params = last_line[crop_start:crop_end]
-                return crop_params
-            
-            return None
+    async def consume_events(self):
+        from amv_core import JobQueue, ConversionEvent
+        self.queue = JobQueue(self.input_files, self.policy)
+        finished_files = 0
+        
+        async for event in self.events(self.queue):
+            self.handle_event(event)
             
-        except Exception as e:
-            self.status_updated.emit(f"❌ Crop detection error: {str(e)}")
-            return None
+            if event.is_final and event.kind != ConversionEvent.CANCELLED:
+                finished_files += 1
+                progress = int(finished_files / self.queue.total * 100)
+                self.progress_updated.emit(progress)
     
-    def run(self):
-        total_files = len(self.input_files)
+    def add_files(self, files):
+        loop, queue = self.loop, self.queue
+        if loop is None or queue is None or queue.closed or loop.is_closed():
+            return False
         
-        for i, input_file in enumerate(self.input_files):
-            if not self.is_running:
-                break
-                
-            try:
-                input_path = Path(input_file)
-                self.status_updated.emit(f"Detecting black bars: {input_path.name}")
-                
-                crop_params = self.detect_crop(input_file)
-                
-                if crop_params:
-                    self.status_updated.emit(f"Detected crop: {crop_params}")
-                    
-                    cropped_folder = input_path.parent / "Cropped"
-                    cropped_folder.mkdir(exist_ok=True)
-                    
-                    output_file = cropped_folder / input_path.name
-                    
-                    self.status_updated.emit(f"Removing black bars: {input_path.name}")
-                    
-                    cmd = [
-                        FFMPEG_PATH, '-i', str(input_file),
-                        '-vf', f'crop={crop_params}',
-                        '-c:a', 'copy',
-                        '-y',
-                        str(output_file)
-                    ]
-                    
-                    process = run_subprocess(
-                        cmd,
-                        stdout=subprocess.PIPE,
-                        stderr=subprocess.PIPE,
-                        text=True
-                    )
-                    
-                    stdout, stderr = process.communicate()
-                    
-                    if process.returncode == 0:
-                        self.status_updated.emit(f"✅ Completed: {output_file.name}")
-                    else:
-                        self.status_updated.emit(f"❌ Failed: {input_path.name}")
-                else:
-                    self.status_updated.emit(f"⚠️ No black bars detected: {input_path.name}")
-                
-                progress = int((i + 1) / total_files * 100)
-                self.progress_updated.emit(progress)
-                
-            except Exception as e:
-                self.status_updated.emit(f"❌ Error: {str(e)}")
+        try:
+            loop.call_soon_threadsafe(self.queue_files, list(files))
+        except RuntimeError:
+            return False
+        return True
+    
+    def queue_files(self, files):
+        added = [file for file in files if self.queue.add(file)]
+        if added:
+            self.status_updated.emit(f"Queued {len(added)} file(s) on the running batch")
+    
+    def run(self):
+        import asyncio
+        try:
+            self.run_coroutine(self.consume_events())
+        except asyncio.CancelledError:
+            pass
         
-        if self.is_running:
+        self.report_finished(self.is_running)
+
+class BlackBarWorker(CoreWorker):
+    def __init__(self, input_files, policy='fifo', fast_decode=False, crop_mode='reencode'):
+        super().__init__(input_files, policy)
+        self.fast_decode = fast_decode
+        self.crop_mode = crop_mode
+    
+    def events(self, queue):
+        from amv_core import remove_black_bars_many
+        return remove_black_bars_many(queue, fast_decode=self.fast_decode, crop_mode=self.crop_mode)
+    
+    def handle_event(self, event):
+        from amv_core import ConversionEvent, ConversionError
+        name = Path(event.input_file).name
+        
+        if event.kind == ConversionEvent.STARTED:
+            self.status_updated.emit(f"Detecting black bars: {name}")
+        elif event.kind == ConversionEvent.CROP_DETECTED:
+            self.status_updated.emit(f"Detected crop: {event.crop}")
+            if event.method == 'bitstream':
+                self.status_updated.emit(f"Removing black bars (lossless): {name}")
+            else:
+                self.status_updated.emit(f"Removing black bars: {name}")
+        elif event.kind == ConversionEvent.NO_CROP:
+            self.status_updated.emit(f"⚠️ No black bars detected: {name}")
+        elif event.kind == ConversionEvent.COMPLETED:
+            self.status_updated.emit(f"✅ Completed: {event.output_file.name}")
+        elif event.kind == ConversionEvent.FAILED:
+            if isinstance(event.error, ConversionError):
+                self.status_updated.emit(f"❌ Failed: {name}")
+            else:
+                self.status_updated.emit(f"❌ Error: {str(event.error)}")
+    
+    def report_finished(self, completed):
+        if completed:
             self.conversion_finished.emit(True, "Black bar removal completed!")
         else:
             self.conversion_finished.emit(False, "Black bar removal cancelled")
+
+class PreviewWorker(AsyncWorker):
+    preview_finished = pyqtSignal(object)
+    preview_failed = pyqtSignal(str)
     
-    def stop(self):
-        self.is_running = False
+    def __init__(self, input_file, profile, start, output_dir):
+        super().__init__()
+        self.input_file = input_file
+        self.profile = profile
+        self.start_time = start
+        self.output_dir = output_dir
+        
+    def run(self):
+        import asyncio
+        from amv_core import preview
+        try:
+            result = self.run_coroutine(preview(
+                self.input_file, self.profile, self.start_time, output_dir=self.output_dir
+            ))
+        except asyncio.CancelledError:
+            return
+        except asyncio.TimeoutError:
+            self.preview_failed.emit("Preview timed out")
+            return
+        except Exception as e:
+            self.preview_failed.emit(str(e))
+            return
+        
+        self.preview_finished.emit(result)
+
+class PreviewDialog(QDialog):
+    def __init__(self, input_file, profile, description, parent=None):
+        super().__init__(parent)
+        self.input_file = input_file
+        self.profile = profile
+        self.preview_worker = None
+        self.output_dirs = []
+        
+        self.setWindowTitle(f"Preview - {Path(input_file).name}")
+        self.setMinimumWidth(380)
+        
+        layout = QVBoxLayout(self)
+        layout.setSpacing(5)
+        
+        settings_label = QLabel(description)
+        layout.addWidget(settings_label)
+        
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel("Start at (s):"))
+        
+        self.start_spin = QDoubleSpinBox()
+        self.start_spin.setRange(0, 86400)
+        self.start_spin.setDecimals(1)
+        self.start_spin.setValue(10)
+        options_layout.addWidget(self.start_spin)
+        options_layout.addStretch()
+        layout.addLayout(options_layout)
+        
+        self.strip_label = QLabel()
+        self.strip_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.strip_label.setMinimumHeight(80)
+        layout.addWidget(self.strip_label)
+        
+        self.result_label = QLabel()
+        self.result_label.setWordWrap(True)
+        layout.addWidget(self.result_label)
+        
+        self.run_btn = QPushButton("Run Preview")
+        self.run_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.run_btn.clicked.connect(self.run_preview)
+        layout.addWidget(self.run_btn)
+        
+    def run_preview(self):
+        self.run_btn.setEnabled(False)
+        self.result_label.setText("Encoding preview...")
+        
+        output_dir = tempfile.mkdtemp(prefix='amv_preview_')
+        self.output_dirs.append(output_dir)
+        
+        self.preview_worker = PreviewWorker(self.input_file, self.profile, self.start_spin.value(), output_dir)
+        self.preview_worker.preview_finished.connect(self.preview_finished)
+        self.preview_worker.preview_failed.connect(self.preview_failed)
+        self.preview_worker.start()
+        
+    def preview_finished(self, result):
+        self.run_btn.setEnabled(True)
+        
+        pixmap = QPixmap(str(result.strip_file))
+        if not pixmap.isNull():
+            self.strip_label.setPixmap(pixmap.scaledToWidth(
+                self.strip_label.width(), Qt.TransformationMode.SmoothTransformation
+            ))
+        
+        self.result_label.setText(
+            f"<b>Encoded:</b> {result.duration:.1f}s from {result.start:.1f}s in {result.elapsed:.2f}s "
+            f"({result.realtime_factor:.1f}x realtime)"
+        )
+        
+    def preview_failed(self, message):
+        self.run_btn.setEnabled(True)
+        self.strip_label.clear()
+        self.result_label.setText(f"❌ Preview failed: {message}")
+        
+    def done(self, result):
+        if self.preview_worker and self.preview_worker.isRunning():
+            self.preview_worker.stop()
+            self.preview_worker.wait()
+        for output_dir in self.output_dirs:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        super().done(result)
+
+def format_duration(seconds):
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes}:{seconds:02d}"
+
+class ThumbnailTask(QRunnable):
+    def __init__(self, input_file, cache, size, signals):
+        super().__init__()
+        self.input_file = input_file
+        self.cache = cache
+        self.size = size
+        self.signals = signals
+        
+    def run(self):
+        import asyncio
+        from amv_core import load_thumbnail
+        try:
+            image_path, info = asyncio.run(load_thumbnail(self.input_file, self.cache, self.size.width()))
+        except Exception:
+            image_path, info = None, {}
+        
+        self.signals.task_finished.emit(self.input_file, self.render(image_path, info.get('duration', 0)))
+    
+    def render(self, image_path, duration):
+        image = QImage(self.size, QImage.Format.Format_ARGB32_Premultiplied)
+        image.fill(QColor(40, 40, 40))
+        
+        painter = QPainter(image)
+        if image_path:
+            thumbnail = QImage(str(image_path))
+            if not thumbnail.isNull():
+                thumbnail = thumbnail.scaled(
+                    self.size, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation
+                )
+                painter.drawImage(
+                    (self.size.width() - thumbnail.width()) // 2,
+                    (self.size.height() - thumbnail.height()) // 2,
+                    thumbnail
+                )
+        
+        if duration:
+            font = painter.font()
+            font.setPixelSize(9)
+            painter.setFont(font)
+            text = format_duration(duration)
+            text_width = painter.fontMetrics().horizontalAdvance(text) + 4
+            badge = QRect(self.size.width() - text_width - 1, self.size.height() - 12, text_width, 11)
+            painter.fillRect(badge, QColor(0, 0, 0, 180))
+            painter.setPen(QColor(255, 255, 255))
+            painter.drawText(badge, Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+        
+        return image
+
+class ThumbnailLoader(QObject):
+    task_finished = pyqtSignal(str, QImage)
+    thumbnail_ready = pyqtSignal(str, QImage)
+    
+    def __init__(self, size, max_workers=2, parent=None):
+        super().__init__(parent)
+        self.size = size
+        self.cache = None
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_workers)
+        self.max_workers = max_workers
+        self.wanted = []
+        self.in_flight = set()
+        self.loaded = set()
+        self.task_finished.connect(self.on_task_finished)
+        
+    def request(self, input_files):
+        self.wanted = [file for file in input_files if file not in self.loaded and file not in self.in_flight]
+        self.wanted.reverse()
+        self.pump()
+        
+    def pump(self):
+        if self.cache is None and self.wanted:
+            from amv_core import ThumbnailCache
+            self.cache = ThumbnailCache()
+        
+        while self.wanted and len(self.in_flight) < self.max_workers:
+            input_file = self.wanted.pop()
+            self.in_flight.add(input_file)
+            self.pool.start(ThumbnailTask(input_file, self.cache, self.size, self))
+            
+    def forget(self, input_file):
+        self.loaded.discard(input_file)
+        
+    def on_task_finished(self, input_file, image):
+        self.in_flight.discard(input_file)
+        self.loaded.add(input_file)
+        self.thumbnail_ready.emit(input_file, image)
+        self.pump()
 
 class DragDropListWidget(QListWidget):
     files_dropped = pyqtSignal(list)
     
+    THUMBNAIL_SIZE = QSize(64, 36)
+    MAX_LOADED_THUMBNAILS = 500
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
         self.original_style = self.styleSheet()
         
+        self.setIconSize(self.THUMBNAIL_SIZE)
+        self.setUniformItemSizes(True)
+        placeholder = QPixmap(self.THUMBNAIL_SIZE)
+        placeholder.fill(QColor(40, 40, 40))
+        self.placeholder_icon = QIcon(placeholder)
+        
+        self.items_by_path = {}
+        self.loaded_thumbnails = OrderedDict()
+        self.thumbnail_loader = ThumbnailLoader(self.THUMBNAIL_SIZE, parent=self)
+        self.thumbnail_loader.thumbnail_ready.connect(self.set_thumbnail)
+        
+        self.visible_timer = QTimer(self)
+        self.visible_timer.setSingleShot(True)
+        self.visible_timer.setInterval(50)
+        self.visible_timer.timeout.connect(self.request_visible_thumbnails)
+        self.verticalScrollBar().valueChanged.connect(self.schedule_thumbnails)
+        self.model().rowsInserted.connect(self.schedule_thumbnails)
+        
+    def add_file(self, file):
+        item = QListWidgetItem(self.placeholder_icon, Path(file).name)
+        item.setData(Qt.ItemDataRole.UserRole, file)
+        item.setToolTip(file)
+        self.items_by_path[file] = item
+        self.addItem(item)
+        
+    def takeItem(self, row):
+        item = super().takeItem(row)
+        if item is not None:
+            file = item.data(Qt.ItemDataRole.UserRole)
+            self.items_by_path.pop(file, None)
+            self.loaded_thumbnails.pop(file, None)
+            self.thumbnail_loader.forget(file)
+        return item
+        
+    def clear(self):
+        super().clear()
+        for file in self.items_by_path:
+            self.thumbnail_loader.forget(file)
+        self.items_by_path.clear()
+        self.loaded_thumbnails.clear()
+        self.thumbnail_loader.request([])
+        
+    def visible_rows(self, margin=5):
+        if self.count() == 0:
+            return range(0)
+        
+        first = self.indexAt(QPoint(0, 0)).row()
+        last = self.indexAt(QPoint(0, self.viewport().height() - 1)).row()
+        first = 0 if first < 0 else first
+        last = self.count() - 1 if last < 0 else last
+        return range(max(0, first - margin), min(self.count(), last + margin + 1))
+        
+    def schedule_thumbnails(self, *args):
+        self.visible_timer.start()
+        
+    def request_visible_thumbnails(self):
+        files = [self.item(row).data(Qt.ItemDataRole.UserRole) for row in self.visible_rows()]
+        self.thumbnail_loader.request(files)
+        
+    def set_thumbnail(self, file, image):
+        item = self.items_by_path.get(file)
+        if item is None:
+            self.thumbnail_loader.forget(file)
+            return
+        
+        item.setIcon(QIcon(QPixmap.fromImage(image)))
+        self.loaded_thumbnails[file] = None
+        self.loaded_thumbnails.move_to_end(file)
+        
+        if len(self.loaded_thumbnails) > self.MAX_LOADED_THUMBNAILS:
+            visible = {self.item(row).data(Qt.ItemDataRole.UserRole) for row in self.visible_rows()}
+            for old_file in list(self.loaded_thumbnails):
+                if len(self.loaded_thumbnails) <= self.MAX_LOADED_THUMBNAILS:
+                    break
+                if old_file in visible:
+                    continue
+                self.loaded_thumbnails.pop(old_file)
+                self.thumbnail_loader.forget(old_file)
+                old_item = self.items_by_path.get(old_file)
+                if old_item is not None:
+                    old_item.setIcon(self.placeholder_icon)
+        
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.schedule_thumbnails()
+        
     def dragEnterEvent(self, event: QDragEnterEvent):
         if event.mimeData().hasUrls():
             video_extensions = {'.mp4', '.avi', '.mov', '.mkv', '.flv', '.wmv', '.webm', '.m4v', 
@@ -264,138 +589,56 @@ class DragDropListWidget(QListWidget):
             painter.drawText(self.viewport().rect(), Qt.AlignmentFlag.AlignCenter, elided_text)
             painter.restore()
 
-class ConversionWorker(QThread):
-    progress_updated = pyqtSignal(int)
+class ConversionWorker(CoreWorker):
     ffmpeg_progress_updated = pyqtSignal(int)
-    status_updated = pyqtSignal(str)
-    conversion_finished = pyqtSignal(bool, str)
     
-    def __init__(self, input_files, resolution_filter, fps, block_size):
-        super().__init__()
-        self.input_files = input_files
-        self.resolution_filter = resolution_filter
-        self.fps = fps
-        self.block_size = block_size
-        self.is_running = True
-        
-    def parse_ffmpeg_progress(self, line):
-        if 'time=' in line:
-            try:
-                time_part = line.split('time=')[1].split()[0]
-                time_parts = time_part.split(':')
-                if len(time_parts) == 3:
-                    hours = float(time_parts[0])
-                    minutes = float(time_parts[1])
-                    seconds = float(time_parts[2])
-                    total_seconds = hours * 3600 + minutes * 60 + seconds
-                    return total_seconds
-            except:
-                pass
-        return None
-        
-    def run(self):
-        total_files = len(self.input_files)
-        
-        for i, input_file in enumerate(self.input_files):
-            if not self.is_running:
-                break
-                
-            try:
-                input_path = Path(input_file)
-                
-                amv_folder = input_path.parent / "AMV Converted"
-                amv_folder.mkdir(exist_ok=True)
-                
-                output_file = amv_folder / input_path.with_suffix('.amv').name
-                
-                self.status_updated.emit(f"Converting: {input_path.name}")
-                self.ffmpeg_progress_updated.emit(0)
-                
-                duration_cmd = [
-                    FFPROBE_PATH, '-v', 'quiet', '-show_entries', 'format=duration',
-                    '-of', 'csv=p=0', str(input_file)
-                ]
-                
-                try:
-                    duration_result = run_subprocess_simple(
-                        duration_cmd, 
-                        capture_output=True, 
-                        text=True
-                    )
-                    video_duration = float(duration_result.stdout.strip()) if duration_result.stdout.strip() else 0
-                except:
-                    video_duration = 0
-                
-                cmd = [
-                    FFMPEG_PATH, '-i', str(input_file),
-                    '-vf', self.resolution_filter,
-                    '-r', str(self.fps),
-                    '-b:v', '300k',
-                    '-pix_fmt', 'yuvj420p',
-                    '-c:v', 'amv',
-                    '-ac', '1',
-                    '-ar', '22050',
-                    '-c:a', 'adpcm_ima_amv',
-                    '-block_size', str(self.block_size),
-                    '-progress', 'pipe:2',
-                    '-y',
-                    str(output_file)
-                ]
-                
-                process = run_subprocess(
-                    cmd, 
-                    stdout=subprocess.PIPE, 
-                    stderr=subprocess.PIPE, 
-                    text=True
-                )
-                
-                while True:
-                    if not self.is_running:
-                        process.terminate()
-                        break
-                        
-                    line = process.stderr.readline()
-                    if not line:
-                        break
-                        
-                    current_time = self.parse_ffmpeg_progress(line)
-                    if current_time and video_duration > 0:
-                        progress = min(int((current_time / video_duration) * 100), 100)
-                        self.ffmpeg_progress_updated.emit(progress)
-                
-                process.wait()
-                
-                if process.returncode == 0:
-                    self.status_updated.emit(f"✅ Completed: {input_path.name}")
-                    self.ffmpeg_progress_updated.emit(100)
-                else:
-                    self.status_updated.emit(f"❌ Failed: {input_path.name}")
-                
-                progress = int((i + 1) / total_files * 100)
-                self.progress_updated.emit(progress)
-                
-            except Exception as e:
-                self.status_updated.emit(f"❌ Error: {str(e)}")
-        
-        if self.is_running:
+    def __init__(self, input_files, profile, policy='fifo'):
+        super().__init__(input_files, policy)
+        self.profile = profile
+    
+    def events(self, queue):
+        from amv_core import convert_many
+        return convert_many(queue, self.profile)
+    
+    def handle_event(self, event):
+        from amv_core import ConversionEvent, ConversionError
+        name = Path(event.input_file).name
+        
+        if event.kind == ConversionEvent.STARTED:
+            self.status_updated.emit(f"Converting: {name}")
+            self.ffmpeg_progress_updated.emit(0)
+        elif event.kind == ConversionEvent.PROGRESS:
+            self.ffmpeg_progress_updated.emit(event.progress)
+        elif event.kind == ConversionEvent.COMPLETED:
+            self.status_updated.emit(f"✅ Completed: {name}")
+            self.ffmpeg_progress_updated.emit(100)
+        elif event.kind == ConversionEvent.FAILED:
+            if isinstance(event.error, ConversionError):
+                self.status_updated.emit(f"❌ Failed: {name}")
+            else:
+                self.status_updated.emit(f"❌ Error: {str(event.error)}")
+    
+    def report_finished(self, completed):
+        if completed:
             self.conversion_finished.emit(True, "All conversions completed!")
         else:
             self.conversion_finished.emit(False, "Conversion cancelled")
-    
-    def stop(self):
-        self.is_running = False
 
 class AdvancedAMVConverter(QMainWindow):
+    SETTINGS_TAB = 1
+    PROGRESS_TAB = 2
+    
     def __init__(self):
         super().__init__()
         self.conversion_worker = None
         self.blackbar_worker = None
+        self.ffmpeg_check_worker = None
+        self.ffmpeg_info = None
         self.input_files = []
+        self.lazy_tabs = {}
+        self.pending_log = []
         
-        self.fps_block_mapping = {
-            10: 2205, 14: 1575, 15: 1470, 18: 1225, 
-            21: 1050, 25: 882, 30: 735
-        }
+        self.fps_block_mapping = FPS_BLOCK_MAPPING
         
         self.init_ui()
         self.center_window()
@@ -419,9 +662,42 @@ class AdvancedAMVConverter(QMainWindow):
         layout.addWidget(self.tab_widget)
         
         self.create_file_selection_tab()
-        self.create_settings_tab()
-        self.create_progress_tab()
-        self.create_about_tab()
+        self.add_lazy_tab("Settings", self.create_settings_tab)
+        self.add_lazy_tab("Progress", self.create_progress_tab)
+        self.add_lazy_tab("About", self.create_about_tab)
+        
+        self.tab_widget.currentChanged.connect(self.ensure_tab)
+        
+    def add_lazy_tab(self, title, builder):
+        tab = QWidget()
+        index = self.tab_widget.addTab(tab, title)
+        self.lazy_tabs[index] = (tab, builder)
+        
+    def ensure_tab(self, index):
+        entry = self.lazy_tabs.pop(index, None)
+        if entry is not None:
+            tab, builder = entry
+            builder(tab)
+            
+    def start_ffmpeg_check(self):
+        self.ffmpeg_check_worker = FfmpegCheckWorker()
+        self.ffmpeg_check_worker.check_finished.connect(self.ffmpeg_check_finished)
+        self.ffmpeg_check_worker.start()
+        
+    def ffmpeg_check_finished(self, info):
+        self.ffmpeg_info = info
+        
+        missing = [name for name in ('ffmpeg', 'ffprobe') if not info[name]]
+        if missing:
+            self.log(f"❌ Not found: {', '.join(missing)}")
+            QMessageBox.warning(self, "Warning", f"Could not run {' and '.join(missing)}. Conversion will not work until it is installed.")
+            return
+            
+        self.log(f"FFmpeg {info['ffmpeg']}, FFprobe {info['ffprobe']}")
+        unsupported = [name for name, supported in info['encoders'].items() if not supported]
+        if unsupported:
+            self.log(f"⚠️ Missing encoders: {', '.join(unsupported)}")
+            QMessageBox.warning(self, "Warning", f"This FFmpeg build lacks the {', '.join(unsupported)} encoder(s) required for AMV output.")
         
     def create_file_selection_tab(self):
         tab = QWidget()
@@ -461,12 +737,16 @@ class AdvancedAMVConverter(QMainWindow):
         self.blackbar_btn.clicked.connect(self.start_blackbar_removal)
         control_layout.addWidget(self.blackbar_btn)
         
+        self.preview_btn = QPushButton("Preview")
+        self.preview_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.preview_btn.clicked.connect(self.show_preview)
+        control_layout.addWidget(self.preview_btn)
+        
         layout.addLayout(control_layout)
         
         self.tab_widget.addTab(tab, "File Selection")
         
-    def create_settings_tab(self):
-        tab = QWidget()
+    def create_settings_tab(self, tab):
         layout = QVBoxLayout(tab)
         layout.setSpacing(10)
         
@@ -524,8 +804,10 @@ class AdvancedAMVConverter(QMainWindow):
         scale_layout.addWidget(self.crop_radio)
         layout.addLayout(scale_layout)
         
+        options_layout = QGridLayout()
+        
         fps_label = QLabel("<b>Frame Rate (FPS)</b>")
-        layout.addWidget(fps_label)
+        options_layout.addWidget(fps_label, 0, 0)
         
         self.fps_combo = QComboBox()
         self.fps_combo.setMaximumWidth(80)
@@ -536,11 +818,37 @@ class AdvancedAMVConverter(QMainWindow):
             self.fps_combo.addItem(str(fps))
         
         self.fps_combo.setCurrentText("15")
-        layout.addWidget(self.fps_combo)
+        options_layout.addWidget(self.fps_combo, 1, 0)
         
-        layout.addStretch()
+        order_label = QLabel("<b>Queue Order</b>")
+        options_layout.addWidget(order_label, 0, 1)
+        
+        self.order_combo = QComboBox()
+        self.order_combo.setMaximumWidth(130)
+        self.order_combo.setCursor(Qt.CursorShape.PointingHandCursor)
+        self.order_combo.addItem("Added order", "fifo")
+        self.order_combo.addItem("Shortest first", "sjf")
+        self.order_combo.setItemData(0, "Process files in the order they were added", Qt.ItemDataRole.ToolTipRole)
+        self.order_combo.setItemData(1, "Shortest estimated jobs first for the quickest first results", Qt.ItemDataRole.ToolTipRole)
+        options_layout.addWidget(self.order_combo, 1, 1)
+        
+        processing_label = QLabel("<b>Processing</b>")
+        options_layout.addWidget(processing_label, 0, 2)
+        
+        self.fast_decode_check = QCheckBox("Fast decoding")
+        self.fast_decode_check.setToolTip("Faster, slightly lower quality decoding of high-resolution sources")
+        self.fast_decode_check.setCursor(Qt.CursorShape.PointingHandCursor)
+        options_layout.addWidget(self.fast_decode_check, 1, 2)
+        
+        self.lossless_crop_check = QCheckBox("Lossless crop")
+        self.lossless_crop_check.setToolTip("Remove black bars from H.264/HEVC without re-encoding when possible")
+        self.lossless_crop_check.setChecked(True)
+        self.lossless_crop_check.setCursor(Qt.CursorShape.PointingHandCursor)
+        options_layout.addWidget(self.lossless_crop_check, 2, 2)
+        
+        layout.addLayout(options_layout)
         
-        self.tab_widget.addTab(tab, "Settings")
+        layout.addStretch()
         
     def on_resolution_changed(self):
         if not hasattr(self, 'crop_radio'):
@@ -555,8 +863,7 @@ class AdvancedAMVConverter(QMainWindow):
         else:
             self.crop_radio.setVisible(True)
         
-    def create_progress_tab(self):
-        tab = QWidget()
+    def create_progress_tab(self, tab):
         layout = QVBoxLayout(tab)
         layout.setSpacing(5)
         
@@ -593,10 +900,11 @@ class AdvancedAMVConverter(QMainWindow):
         stop_layout.addStretch()
         layout.addLayout(stop_layout)
         
-        self.tab_widget.addTab(tab, "Progress")
+        for message in self.pending_log:
+            self.log_text.append(message)
+        self.pending_log.clear()
         
-    def create_about_tab(self):
-        tab = QWidget()
+    def create_about_tab(self, tab):
         layout = QVBoxLayout(tab)
         layout.setSpacing(10)
         
@@ -626,8 +934,6 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
         
         layout.addStretch()
         
-        self.tab_widget.addTab(tab, "About")
-        
     def center_window(self):
         screen = QApplication.primaryScreen().geometry()
         window = self.geometry()
@@ -654,28 +960,42 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
         )
         
         if files:
+            new_files = []
             for file in files:
                 if file not in self.input_files:
                     self.input_files.append(file)
-                    self.file_list.addItem(Path(file).name)
+                    self.file_list.add_file(file)
+                    new_files.append(file)
                     
-            self.log_text.append(f"Added {len(files)} file(s)")
+            self.log(f"Added {len(files)} file(s)")
             self.update_file_list_placeholder()
+            
+            if new_files:
+                self.queue_on_running_worker(new_files)
     
     def handle_dropped_files(self, files):
-        added_count = 0
+        new_files = []
         for file in files:
             if file not in self.input_files:
                 self.input_files.append(file)
-                self.file_list.addItem(Path(file).name)
-                added_count += 1
+                self.file_list.add_file(file)
+                new_files.append(file)
         
-        if added_count > 0:
-            self.log_text.append(f"Dropped {added_count} file(s)")
+        if new_files:
+            self.log(f"Dropped {len(new_files)} file(s)")
         else:
-            self.log_text.append("No new files added (duplicates ignored)")
+            self.log("No new files added (duplicates ignored)")
         
         self.update_file_list_placeholder()
+        
+        if new_files:
+            self.queue_on_running_worker(new_files)
+    
+    def log(self, message):
+        if self.PROGRESS_TAB in self.lazy_tabs:
+            self.pending_log.append(message)
+        else:
+            self.log_text.append(message)
     
     def update_file_list_placeholder(self):
         pass
@@ -683,7 +1003,7 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
     def clear_files(self):
         self.input_files.clear()
         self.file_list.clear()
-        self.log_text.append("Cleared all files")
+        self.log("Cleared all files")
         self.update_file_list_placeholder()
     
     def show_context_menu(self, position):
@@ -702,7 +1022,7 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
             item = self.file_list.takeItem(current_row)
             if current_row < len(self.input_files):
                 removed_file = self.input_files.pop(current_row)
-                self.log_text.append(f"Removed: {Path(removed_file).name}")
+                self.log(f"Removed: {Path(removed_file).name}")
                 self.update_file_list_placeholder()
         
     def start_conversion(self):
@@ -710,26 +1030,12 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
             QMessageBox.warning(self, "Warning", "Please add video files first!")
             return
             
-        selected_resolution = None
-        for res, radio in self.resolution_radios.items():
-            if radio.isChecked():
-                selected_resolution = res.replace('p', '')
-                break
+        self.ensure_tab(self.PROGRESS_TAB)
         
-        scale_type = None
-        if self.preserved_radio.isChecked():
-            scale_type = "Preserved"
-        elif self.forced_radio.isChecked():
-            scale_type = "Forced"
-        elif self.crop_radio.isChecked():
-            scale_type = "Crop"
+        profile = self.selected_profile()
+        selected_resolution, scale_type, selected_fps = profile.resolution, profile.scale_type, profile.fps
         
-        selected_fps = int(self.fps_combo.currentText())
-        
-        resolution_filter = self.build_resolution_filter(selected_resolution, scale_type)
-        block_size = self.fps_block_mapping.get(selected_fps, 1470)
-        
-        self.tab_widget.setCurrentIndex(2)
+        self.tab_widget.setCurrentIndex(self.PROGRESS_TAB)
         
         self.convert_btn.setEnabled(False)
         self.blackbar_btn.setEnabled(False)
@@ -750,48 +1056,82 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
             self.ffmpeg_progress_bar.setValue(0)
         
         self.log_text.clear()
-        self.log_text.append(f"Starting conversion of {len(self.input_files)} file(s)")
-        self.log_text.append(f"Resolution: {selected_resolution}p ({scale_type})")
-        self.log_text.append(f"FPS: {selected_fps}")
-        self.log_text.append("-" * 50)
-        
-        self.conversion_worker = ConversionWorker(
-            self.input_files, resolution_filter, selected_fps, block_size
-        )
+        self.log(f"Starting conversion of {len(self.input_files)} file(s)")
+        self.log(f"Resolution: {selected_resolution}p ({scale_type})")
+        self.log(f"FPS: {selected_fps}")
+        if profile.fast_decode:
+            self.log("Decoding: Fast")
+        self.log("-" * 50)
+        
+        self.conversion_worker = ConversionWorker(self.input_files, profile, self.selected_policy())
         self.conversion_worker.progress_updated.connect(self.update_progress)
         self.conversion_worker.ffmpeg_progress_updated.connect(self.update_ffmpeg_progress)
         self.conversion_worker.status_updated.connect(self.update_status)
         self.conversion_worker.conversion_finished.connect(self.conversion_finished)
         self.conversion_worker.start()
     
-    def build_resolution_filter(self, resolution, scale_type):
-        height = resolution
-        
-        if scale_type == "Preserved":
-            return f"scale=-2:{height}"
-        elif scale_type == "Forced":
-            width_mapping = {
-                "240": "320", "176": "208", "160": "208", 
-                "144": "176", "128": "176", "96": "128"
-            }
-            width = width_mapping.get(height, "320")
-            return f"scale={width}:{height}"
-        elif scale_type == "Crop":
-            width_mapping = {
-                "240": "320", "176": "208", "160": "208", 
-                "144": "176", "128": "176", "96": "128"
-            }
-            width = width_mapping.get(height, "320")
-            return f"scale=-2:{height},crop={width}:{height}"
-        
-        return f"scale=-2:{height}"
+    def selected_settings(self):
+        self.ensure_tab(self.SETTINGS_TAB)
+        
+        selected_resolution = None
+        for res, radio in self.resolution_radios.items():
+            if radio.isChecked():
+                selected_resolution = res.replace('p', '')
+                break
+        
+        scale_type = None
+        if self.preserved_radio.isChecked():
+            scale_type = "Preserved"
+        elif self.forced_radio.isChecked():
+            scale_type = "Forced"
+        elif self.crop_radio.isChecked():
+            scale_type = "Crop"
+        
+        selected_fps = int(self.fps_combo.currentText())
+        
+        return selected_resolution, scale_type, selected_fps
+    
+    def selected_profile(self):
+        from amv_core import ConversionProfile
+        selected_resolution, scale_type, selected_fps = self.selected_settings()
+        block_size = self.fps_block_mapping.get(selected_fps, 1470)
+        return ConversionProfile(
+            selected_resolution, scale_type, selected_fps, block_size,
+            fast_decode=self.fast_decode_check.isChecked()
+        )
+    
+    def selected_policy(self):
+        self.ensure_tab(self.SETTINGS_TAB)
+        return self.order_combo.currentData()
+    
+    def queue_on_running_worker(self, files):
+        for worker in (self.conversion_worker, self.blackbar_worker):
+            if worker and worker.isRunning() and worker.add_files(files):
+                return
+    
+    def show_preview(self):
+        if not self.input_files:
+            QMessageBox.warning(self, "Warning", "Please add video files first!")
+            return
+        
+        current_row = self.file_list.currentRow()
+        input_file = self.input_files[current_row] if 0 <= current_row < len(self.input_files) else self.input_files[0]
+        
+        profile = self.selected_profile()
+        selected_resolution, scale_type, selected_fps = profile.resolution, profile.scale_type, profile.fps
+        
+        description = f"{selected_resolution}p ({scale_type}), {selected_fps} FPS"
+        dialog = PreviewDialog(input_file, profile, description, self)
+        dialog.exec()
         
     def start_blackbar_removal(self):
         if not self.input_files:
             QMessageBox.warning(self, "Warning", "Please add video files first!")
             return
             
-        self.tab_widget.setCurrentIndex(2)
+        self.ensure_tab(self.PROGRESS_TAB)
+        
+        self.tab_widget.setCurrentIndex(self.PROGRESS_TAB)
         
         self.convert_btn.setEnabled(False)
         self.blackbar_btn.setEnabled(False)
@@ -805,10 +1145,13 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
         self.ffmpeg_progress_bar.setVisible(False)
         
         self.log_text.clear()
-        self.log_text.append(f"Starting black bar removal for {len(self.input_files)} file(s)")
-        self.log_text.append("-" * 50)
+        self.log(f"Starting black bar removal for {len(self.input_files)} file(s)")
+        self.log("-" * 50)
         
-        self.blackbar_worker = BlackBarWorker(self.input_files)
+        self.blackbar_worker = BlackBarWorker(
+            self.input_files, self.selected_policy(), self.fast_decode_check.isChecked(),
+            'auto' if self.lossless_crop_check.isChecked() else 'reencode'
+        )
         self.blackbar_worker.progress_updated.connect(self.update_progress)
         self.blackbar_worker.status_updated.connect(self.update_status)
         self.blackbar_worker.conversion_finished.connect(self.conversion_finished)
@@ -837,7 +1180,7 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
         self.ffmpeg_progress_bar.setValue(value)
         
     def update_status(self, message):
-        self.log_text.append(message)
+        self.log(message)
         
         scrollbar = self.log_text.verticalScrollBar()
         scrollbar.setValue(scrollbar.maximum())
@@ -852,8 +1195,8 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
             if self.ffmpeg_progress_bar.isVisible():
                 self.ffmpeg_progress_bar.setValue(100)
             
-        self.log_text.append("-" * 50)
-        self.log_text.append(message)
+        self.log("-" * 50)
+        self.log(message)
         
         self.file_progress_label.setVisible(False)
         self.file_progress_bar.setVisible(False)
@@ -861,12 +1204,32 @@ MP4, AVI, MOV, MKV, WMV, FLV, WEBM, M4V, MPG, MPEG, M2V, M2TS, MTS, TS, VOB, 3GP
         self.ffmpeg_progress_bar.setVisible(False)
 
 def main():
-    app = QApplication(sys.argv)
+    profiler = None
+    argv = list(sys.argv)
+    if '--startup-profile' in argv:
+        argv.remove('--startup-profile')
+        profiler = StartupProfiler(STARTUP_TIME)
+        profiler.mark("imports", IMPORTS_DONE_TIME)
+    
+    app = QApplication(argv)
     app.setStyle('Fusion')
     
+    if profiler:
+        profiler.mark("application")
+        app.installEventFilter(profiler)
+    
     window = AdvancedAMVConverter()
+    
+    if profiler:
+        profiler.mark("window construction")
+    
     window.show()
     
+    if profiler:
+        profiler.mark("show")
+    
+    QTimer.singleShot(0, window.start_ffmpeg_check)
+    
     sys.exit(app.exec())
 
 if __name__ == '__main__':
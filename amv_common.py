@@ -0,0 +1,30 @@
+import sys
+import os
+
+def get_resource_path(relative_path):
+    if getattr(sys, 'frozen', False):
+        base_path = sys._MEIPASS
+    else:
+        base_path = os.path.dirname(__file__)
+
+    return os.path.join(base_path, relative_path)
+
+def get_ffmpeg_path():
+    if getattr(sys, 'frozen', False):
+        ffmpeg_path = get_resource_path('ffmpeg.exe')
+        ffprobe_path = get_resource_path('ffprobe.exe')
+    else:
+        ffmpeg_path = 'ffmpeg'
+        ffprobe_path = 'ffprobe'
+
+    return ffmpeg_path, ffprobe_path
+
+FPS_BLOCK_MAPPING = {
+    10: 2205, 14: 1575, 15: 1470, 18: 1225,
+    21: 1050, 25: 882, 30: 735
+}
+
+WIDTH_MAPPING = {
+    "240": "320", "176": "208", "160": "208",
+    "144": "176", "128": "176", "96": "128"
+}
@@ -0,0 +1,993 @@
+import sys
+import os
+import time
+import json
+import heapq
+import asyncio
+import hashlib
+import itertools
+import threading
+import tempfile
+import subprocess
+from pathlib import Path
+
+from amv_common import get_resource_path, get_ffmpeg_path, FPS_BLOCK_MAPPING, WIDTH_MAPPING
+
+FFMPEG_PATH, FFPROBE_PATH = get_ffmpeg_path()
+
+CREATION_FLAGS = subprocess.CREATE_NO_WINDOW if sys.platform == 'win32' else 0
+
+def run_subprocess(cmd, **kwargs):
+    default_kwargs = {
+        'creationflags': CREATION_FLAGS
+    }
+    default_kwargs.update(kwargs)
+    return subprocess.Popen(cmd, **default_kwargs)
+
+def run_subprocess_simple(cmd, **kwargs):
+    default_kwargs = {
+        'creationflags': CREATION_FLAGS
+    }
+    default_kwargs.update(kwargs)
+    return subprocess.run(cmd, **default_kwargs)
+
+async def create_subprocess(cmd, **kwargs):
+    default_kwargs = {
+        'creationflags': CREATION_FLAGS
+    }
+    default_kwargs.update(kwargs)
+    return await asyncio.create_subprocess_exec(*[str(arg) for arg in cmd], **default_kwargs)
+
+def check_ffmpeg(timeout=10):
+    info = {
+        'ffmpeg': None,
+        'ffprobe': None,
+        'encoders': {'amv': False, 'adpcm_ima_amv': False}
+    }
+
+    for key, path in (('ffmpeg', FFMPEG_PATH), ('ffprobe', FFPROBE_PATH)):
+        try:
+            result = run_subprocess_simple(
+                [path, '-hide_banner', '-version'],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            continue
+
+        if result.returncode == 0 and result.stdout:
+            first_line = result.stdout.splitlines()[0]
+            parts = first_line.split()
+            info[key] = parts[2] if len(parts) > 2 and parts[1] == 'version' else first_line
+
+    if info['ffmpeg']:
+        try:
+            result = run_subprocess_simple(
+                [FFMPEG_PATH, '-hide_banner', '-encoders'],
+                capture_output=True,
+                text=True,
+                timeout=timeout
+            )
+            encoders = {line.split()[1] for line in result.stdout.splitlines() if len(line.split()) > 1}
+            for encoder in info['encoders']:
+                info['encoders'][encoder] = encoder in encoders
+        except (OSError, subprocess.TimeoutExpired):
+            pass
+
+    return info
+
+def build_resolution_filter(resolution, scale_type):
+    height = str(resolution)
+
+    if scale_type == "Preserved":
+        return f"scale=-2:{height}"
+    elif scale_type == "Forced":
+        width = WIDTH_MAPPING.get(height, "320")
+        return f"scale={width}:{height}"
+    elif scale_type == "Crop":
+        width = WIDTH_MAPPING.get(height, "320")
+        return f"scale=-2:{height},crop={width}:{height}"
+
+    return f"scale=-2:{height}"
+
+def parse_frame_rate(value):
+    try:
+        if '/' in str(value):
+            numerator, denominator = str(value).split('/', 1)
+            return float(numerator) / float(denominator) if float(denominator) else 0
+        return float(value)
+    except (TypeError, ValueError):
+        return 0
+
+def even(value):
+    return max(2, int(value) - int(value) % 2)
+
+def build_filter_graph(resolution, scale_type, fps=None, crop=None, source=None):
+    height = int(resolution)
+    width = int(WIDTH_MAPPING.get(str(resolution), "320"))
+    source = source or {}
+    source_width = source.get('width') or 0
+    source_height = source.get('height') or 0
+    source_fps = source.get('fps') or 0
+
+    filters = []
+    if fps and not (source_fps and source_fps <= fps):
+        filters.append(f"fps={fps}")
+
+    if not (source_width and source_height):
+        if crop:
+            filters.append(f"crop={crop}")
+        if scale_type == "Crop":
+            filters.append(f"crop='min(iw,ih*{width}/{height})':'min(ih,iw*{height}/{width})'")
+            filters.append(f"scale={width}:{height}")
+        else:
+            filters.append(build_resolution_filter(height, scale_type))
+        return ",".join(filters)
+
+    region_width, region_height, region_x, region_y = source_width, source_height, 0, 0
+    if crop:
+        try:
+            crop_width, crop_height, crop_x, crop_y = (int(value) for value in crop.split(':'))
+            region_width, region_height, region_x, region_y = crop_width, crop_height, crop_x, crop_y
+        except ValueError:
+            pass
+
+    if scale_type == "Forced":
+        output_width, output_height = width, height
+    elif scale_type == "Crop":
+        output_width, output_height = width, height
+        if region_height * width <= region_width * height:
+            cropped_width = even(region_height * width / height)
+            region_x += (region_width - cropped_width) // 2
+            region_width = cropped_width
+        else:
+            cropped_height = even(region_width * height / width)
+            region_y += (region_height - cropped_height) // 2
+            region_height = cropped_height
+    else:
+        output_width, output_height = even(round(region_width * height / region_height)), height
+
+    if (region_width, region_height) != (source_width, source_height):
+        filters.append(f"crop={region_width}:{region_height}:{region_x}:{region_y}")
+
+    if (output_width, output_height) != (region_width, region_height):
+        filters.append(f"scale={output_width}:{output_height}")
+
+    return ",".join(filters) or "null"
+
+DECODER_PROFILES = {
+    'h264': ['-skip_loop_filter', 'nonref', '-flags2', '+fast'],
+    'hevc': ['-skip_loop_filter', 'nonref'],
+    'vp8': ['-skip_loop_filter', 'nonref'],
+    'vp9': ['-skip_loop_filter', 'nonref'],
+}
+
+LOWRES_CODECS = {
+    'mjpeg': 3, 'mpeg1video': 3, 'mpeg2video': 3, 'mpeg4': 3, 'h263': 3, 'msmpeg4v3': 3
+}
+
+KEYFRAME_CROP_FRAMES = 12
+
+def build_decoder_args(source, target_height, allow_lowres=True):
+    codec = (source or {}).get('codec', '')
+    args = list(DECODER_PROFILES.get(codec, []))
+
+    lowres = 0
+    source_height = (source or {}).get('height') or 0
+    if allow_lowres and codec in LOWRES_CODECS and source_height:
+        while (lowres < LOWRES_CODECS[codec]
+               and -(-source_height >> (lowres + 1)) >= int(target_height) * 2):
+            lowres += 1
+        if lowres:
+            args += ['-lowres', str(lowres)]
+
+    return args, lowres
+
+def lowres_source(source, lowres):
+    if not lowres:
+        return source
+
+    source = dict(source)
+    source['width'] = 0
+    source['height'] = 0
+    return source
+
+BITSTREAM_CROP_FILTERS = {
+    'h264': 'h264_metadata',
+    'hevc': 'hevc_metadata',
+}
+
+def chroma_crop_units(pix_fmt):
+    if not pix_fmt:
+        return None
+    if '420' in pix_fmt or pix_fmt.startswith(('nv12', 'nv21', 'p010', 'p016')):
+        return 2, 2
+    if '422' in pix_fmt or pix_fmt.startswith(('nv16', 'p210')):
+        return 2, 1
+    if '444' in pix_fmt or pix_fmt.startswith(('gray', 'gbr')):
+        return 1, 1
+    return None
+
+def build_bitstream_crop(source, crop):
+    codec = source.get('codec', '')
+    bitstream_filter = BITSTREAM_CROP_FILTERS.get(codec)
+    units = chroma_crop_units(source.get('pix_fmt', ''))
+    if not bitstream_filter or not units or source.get('rotation'):
+        return None
+
+    try:
+        crop_width, crop_height, crop_x, crop_y = (int(value) for value in crop.split(':'))
+    except ValueError:
+        return None
+
+    width = source.get('width') or 0
+    height = source.get('height') or 0
+    if not (width and height):
+        return None
+
+    unit_x, unit_y = units
+    coded_width = max(source.get('coded_width') or 0, width)
+    coded_height = max(source.get('coded_height') or 0, height)
+
+    if codec == 'h264':
+        if source.get('field_order') != 'progressive':
+            unit_y *= 2
+        macroblock_height = 16 if source.get('field_order') == 'progressive' else 32
+        coded_width = max(coded_width, -(-width // 16) * 16)
+        coded_height = max(coded_height, -(-height // macroblock_height) * macroblock_height)
+
+    offsets = {
+        'crop_left': crop_x,
+        'crop_right': coded_width - crop_x - crop_width,
+        'crop_top': crop_y,
+        'crop_bottom': coded_height - crop_y - crop_height,
+    }
+    for name, value in offsets.items():
+        unit = unit_x if name in ('crop_left', 'crop_right') else unit_y
+        if value < 0 or value % unit:
+            return None
+
+    options = ':'.join(f"{name}={value}" for name, value in offsets.items())
+    return ['-c', 'copy', '-bsf:v', f"{bitstream_filter}={options}"]
+
+def parse_ffmpeg_progress(line):
+    if 'time=' in line:
+        try:
+            time_part = line.split('time=')[1].split()[0]
+            time_parts = time_part.split(':')
+            if len(time_parts) == 3:
+                hours = float(time_parts[0])
+                minutes = float(time_parts[1])
+                seconds = float(time_parts[2])
+                total_seconds = hours * 3600 + minutes * 60 + seconds
+                return total_seconds
+        except:
+            pass
+    return None
+
+def parse_crop(stderr):
+    crop_lines = [line for line in stderr.split('\n') if 'crop=' in line]
+    if crop_lines:
+        last_line = crop_lines[-1]
+        crop_start = last_line.find('crop=') + 5
+        crop_end = last_line.find(' ', crop_start)
+        if crop_end == -1:
+            crop_end = len(last_line)
+        return last_line[crop_start:crop_end].strip()
+
+    return None
+
+class ConversionError(Exception):
+    def __init__(self, input_file, returncode, stderr=''):
+        super().__init__(f"ffmpeg exited with code {returncode}: {Path(input_file).name}")
+        self.input_file = input_file
+        self.returncode = returncode
+        self.stderr = stderr
+
+class ConversionProfile:
+    def __init__(self, resolution="240", scale_type="Preserved", fps=15, block_size=None,
+                 video_bitrate='300k', fast_decode=False):
+        self.resolution = str(resolution).replace('p', '')
+        self.scale_type = scale_type
+        self.fps = int(fps)
+        self.block_size = block_size or FPS_BLOCK_MAPPING.get(self.fps, 1470)
+        self.video_bitrate = video_bitrate
+        self.fast_decode = fast_decode
+
+    @property
+    def resolution_filter(self):
+        return build_resolution_filter(self.resolution, self.scale_type)
+
+    def video_filter(self, crop=None, source=None):
+        return build_filter_graph(self.resolution, self.scale_type, self.fps, crop, source)
+
+    def output_path(self, input_file):
+        input_path = Path(input_file)
+        return input_path.parent / "AMV Converted" / input_path.with_suffix('.amv').name
+
+    def build_command(self, input_file, output_file, crop=None, input_args=(), output_args=(), source=None):
+        if self.fast_decode and source:
+            decoder_args, lowres = build_decoder_args(source, self.resolution, allow_lowres=not crop)
+            input_args = [*decoder_args, *input_args]
+            source = lowres_source(source, lowres)
+
+        return [
+            FFMPEG_PATH, *input_args, '-i', str(input_file),
+            '-vf', self.video_filter(crop, source),
+            *output_args,
+            '-r', str(self.fps),
+            '-b:v', self.video_bitrate,
+            '-pix_fmt', 'yuvj420p',
+            '-c:v', 'amv',
+            '-ac', '1',
+            '-ar', '22050',
+            '-c:a', 'adpcm_ima_amv',
+            '-block_size', str(self.block_size),
+            '-progress', 'pipe:2',
+            '-y',
+            str(output_file)
+        ]
+
+class ConversionEvent:
+    STARTED = 'started'
+    PROGRESS = 'progress'
+    CROP_DETECTED = 'crop_detected'
+    NO_CROP = 'no_crop'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, kind, input_file, index=None, progress=None, output_file=None,
+                 crop=None, error=None, method=None):
+        self.kind = kind
+        self.input_file = input_file
+        self.index = index
+        self.progress = progress
+        self.output_file = output_file
+        self.crop = crop
+        self.error = error
+        self.method = method
+
+    @property
+    def is_final(self):
+        return self.kind in (self.COMPLETED, self.NO_CROP, self.FAILED, self.CANCELLED)
+
+    def __repr__(self):
+        return f"ConversionEvent({self.kind!r}, {Path(self.input_file).name!r}, progress={self.progress!r})"
+
+def _emit(on_event, kind, input_file, **kwargs):
+    if on_event is not None:
+        on_event(ConversionEvent(kind, input_file, **kwargs))
+
+async def _terminate(process):
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+        await process.wait()
+
+async def _run_ffprobe(cmd, timeout):
+    try:
+        process = await create_subprocess(
+            cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+    except OSError:
+        return ''
+
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        return ''
+    finally:
+        await _terminate(process)
+
+    return stdout.decode(errors='replace').strip()
+
+async def probe_duration(input_file, timeout=30):
+    cmd = [
+        FFPROBE_PATH, '-v', 'quiet', '-show_entries', 'format=duration',
+        '-of', 'csv=p=0', str(input_file)
+    ]
+
+    output = await _run_ffprobe(cmd, timeout)
+    try:
+        return float(output) if output else 0
+    except ValueError:
+        return 0
+
+async def probe_source(input_file, timeout=30):
+    cmd = [
+        FFPROBE_PATH, '-v', 'quiet', '-select_streams', 'v:0',
+        '-show_entries', 'format=duration:stream=codec_name,width,height,coded_width,coded_height,'
+                         'pix_fmt,field_order,r_frame_rate:stream_tags=rotate:stream_side_data=rotation',
+        '-of', 'json', str(input_file)
+    ]
+
+    info = {
+        'duration': 0, 'codec': '', 'width': 0, 'height': 0, 'fps': 0,
+        'coded_width': 0, 'coded_height': 0, 'pix_fmt': '', 'field_order': '', 'rotation': 0
+    }
+    output = await _run_ffprobe(cmd, timeout)
+    try:
+        data = json.loads(output) if output else {}
+    except ValueError:
+        return info
+
+    try:
+        info['duration'] = float(data.get('format', {}).get('duration', 0))
+    except (TypeError, ValueError):
+        pass
+
+    streams = data.get('streams') or [{}]
+    info['width'] = int(streams[0].get('width') or 0)
+    info['height'] = int(streams[0].get('height') or 0)
+    info['fps'] = parse_frame_rate(streams[0].get('r_frame_rate'))
+    info['codec'] = streams[0].get('codec_name') or ''
+    info['coded_width'] = int(streams[0].get('coded_width') or 0)
+    info['coded_height'] = int(streams[0].get('coded_height') or 0)
+    info['pix_fmt'] = streams[0].get('pix_fmt') or ''
+    info['field_order'] = streams[0].get('field_order') or ''
+
+    rotation = streams[0].get('tags', {}).get('rotate', 0)
+    for side_data in streams[0].get('side_data_list', []):
+        rotation = side_data.get('rotation', rotation)
+    try:
+        info['rotation'] = int(float(rotation))
+        if abs(info['rotation']) % 180 == 90:
+            info['width'], info['height'] = info['height'], info['width']
+    except (TypeError, ValueError):
+        pass
+
+    return info
+
+async def _convert(input_file, profile, on_event, index, source=None):
+    output_file = profile.output_path(input_file)
+    output_file.parent.mkdir(exist_ok=True)
+
+    _emit(on_event, ConversionEvent.STARTED, input_file, index=index, progress=0, output_file=output_file)
+
+    if source is None:
+        source = await probe_source(input_file)
+    video_duration = source['duration']
+
+    process = await create_subprocess(
+        profile.build_command(input_file, output_file, source=source),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+    tail = []
+    last_progress = 0
+    try:
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                break
+
+            line = line.decode(errors='replace')
+            tail.append(line)
+            del tail[:-20]
+
+            current_time = parse_ffmpeg_progress(line)
+            if current_time and video_duration > 0:
+                progress = min(int((current_time / video_duration) * 100), 100)
+                if progress != last_progress:
+                    last_progress = progress
+                    _emit(on_event, ConversionEvent.PROGRESS, input_file, index=index, progress=progress)
+
+        await process.wait()
+    finally:
+        await _terminate(process)
+
+    if process.returncode != 0:
+        raise ConversionError(input_file, process.returncode, ''.join(tail))
+
+    _emit(on_event, ConversionEvent.COMPLETED, input_file, index=index, progress=100, output_file=output_file)
+    return output_file
+
+async def convert(input_file, profile, on_event=None, timeout=None, index=None):
+    return await asyncio.wait_for(_convert(input_file, profile, on_event, index), timeout)
+
+async def detect_crop(input_file, timeout=60, start=1, duration=5, fast=False):
+    if fast:
+        input_args = ['-skip_frame', 'nokey']
+        crop_args = ['-vf', 'cropdetect=skip=0', '-frames:v', str(KEYFRAME_CROP_FRAMES)]
+    else:
+        input_args = ['-t', str(duration)]
+        crop_args = ['-vf', 'cropdetect']
+
+    cmd = [
+        FFMPEG_PATH, '-ss', str(start), *input_args, '-i', str(input_file),
+        *crop_args, '-an', '-f', 'null', '-'
+    ]
+
+    process = await create_subprocess(
+        cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        raise asyncio.TimeoutError(f"Crop detection timed out after {timeout}s") from None
+    finally:
+        await _terminate(process)
+
+    stderr = stderr.decode(errors='replace')
+    if process.returncode != 0:
+        raise ConversionError(input_file, process.returncode, stderr[-2000:])
+
+    return parse_crop(stderr)
+
+async def _run_ffmpeg(cmd, input_file):
+    process = await create_subprocess(
+        cmd,
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE
+    )
+
+    try:
+        _, stderr = await process.communicate()
+    finally:
+        await _terminate(process)
+
+    stderr = stderr.decode(errors='replace')
+    if process.returncode != 0:
+        raise ConversionError(input_file, process.returncode, stderr[-2000:])
+
+    return stderr
+
+CROP_MODES = ('reencode', 'auto')
+
+async def _remove_black_bars(input_file, on_event, index, fast_decode, crop_mode, source=None):
+    input_path = Path(input_file)
+    _emit(on_event, ConversionEvent.STARTED, input_file, index=index, progress=0)
+
+    try:
+        crop_params = await detect_crop(input_file, fast=fast_decode)
+    except ConversionError:
+        if not fast_decode:
+            raise
+        crop_params = await detect_crop(input_file)
+    if not crop_params:
+        _emit(on_event, ConversionEvent.NO_CROP, input_file, index=index)
+        return None
+
+    bitstream_args = None
+    if crop_mode == 'auto':
+        if source is None:
+            source = await probe_source(input_file)
+        bitstream_args = build_bitstream_crop(source, crop_params)
+
+    method = 'bitstream' if bitstream_args else 'reencode'
+    _emit(on_event, ConversionEvent.CROP_DETECTED, input_file, index=index, crop=crop_params, method=method)
+
+    cropped_folder = input_path.parent / "Cropped"
+    cropped_folder.mkdir(exist_ok=True)
+    output_file = cropped_folder / input_path.name
+
+    if bitstream_args:
+        cmd = [FFMPEG_PATH, '-i', str(input_file), *bitstream_args, '-y', str(output_file)]
+        try:
+            await _run_ffmpeg(cmd, input_file)
+        except ConversionError:
+            method = 'reencode'
+        else:
+            cropped = await probe_source(output_file)
+            crop_size = tuple(int(value) for value in crop_params.split(':')[:2])
+            if (cropped['width'], cropped['height']) != crop_size:
+                method = 'reencode'
+
+    if method == 'reencode':
+        cmd = [
+            FFMPEG_PATH, '-i', str(input_file),
+            '-vf', f'crop={crop_params}',
+            '-c:a', 'copy',
+            '-y',
+            str(output_file)
+        ]
+
+        await _run_ffmpeg(cmd, input_file)
+
+    _emit(on_event, ConversionEvent.COMPLETED, input_file, index=index, progress=100,
+          output_file=output_file, crop=crop_params, method=method)
+    return output_file
+
+async def remove_black_bars(input_file, on_event=None, timeout=None, index=None, fast_decode=False,
+                            crop_mode='reencode'):
+    return await asyncio.wait_for(
+        _remove_black_bars(input_file, on_event, index, fast_decode, crop_mode),
+        timeout
+    )
+
+class PreviewResult:
+    def __init__(self, input_file, output_file, strip_file, start, duration, elapsed):
+        self.input_file = input_file
+        self.output_file = output_file
+        self.strip_file = strip_file
+        self.start = start
+        self.duration = duration
+        self.elapsed = elapsed
+
+    @property
+    def realtime_factor(self):
+        return self.duration / self.elapsed if self.elapsed > 0 else 0
+
+async def _preview(input_file, profile, start, duration, thumbnails, output_dir):
+    if output_dir is None:
+        output_dir = tempfile.mkdtemp(prefix='amv_preview_')
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    output_file = output_dir / Path(input_file).with_suffix('.amv').name
+    strip_file = output_dir / (Path(input_file).stem + '_strip.png')
+
+    source = await probe_source(input_file)
+    if source['duration'] > 0:
+        start = min(start, max(0, source['duration'] - duration))
+
+    started = time.perf_counter()
+    stderr = await _run_ffmpeg(
+        profile.build_command(
+            input_file, output_file,
+            input_args=['-ss', str(start)],
+            output_args=['-t', str(duration)],
+            source=source
+        ),
+        input_file
+    )
+    elapsed = time.perf_counter() - started
+
+    encoded_times = [parse_ffmpeg_progress(line) for line in stderr.splitlines()]
+    encoded_times = [value for value in encoded_times if value]
+    encoded_duration = max(encoded_times) if encoded_times else duration
+
+    tile_rate = thumbnails / max(encoded_duration, 0.1)
+    await _run_ffmpeg(
+        [
+            FFMPEG_PATH, '-i', str(output_file),
+            '-vf', f'fps={tile_rate:.4f},tile={thumbnails}x1',
+            '-frames:v', '1',
+            '-y',
+            str(strip_file)
+        ],
+        input_file
+    )
+
+    return PreviewResult(input_file, output_file, strip_file, start, encoded_duration, elapsed)
+
+async def preview(input_file, profile, start=0, duration=3, thumbnails=5, output_dir=None, timeout=30):
+    return await asyncio.wait_for(
+        _preview(input_file, profile, start, duration, thumbnails, output_dir),
+        timeout
+    )
+
+SCHEDULING_POLICIES = ('fifo', 'sjf', 'lpt')
+
+REFERENCE_PIXELS = 1280 * 720
+
+def estimate_cost(info):
+    if not info or not info.get('duration'):
+        return float('inf')
+
+    pixels = info.get('width', 0) * info.get('height', 0) or REFERENCE_PIXELS
+    return info['duration'] * pixels / REFERENCE_PIXELS
+
+class JobQueue:
+    def __init__(self, input_files=(), policy='fifo', probe_concurrency=4, probe_wait=2.0):
+        if policy not in SCHEDULING_POLICIES:
+            raise ValueError(f"Unknown scheduling policy: {policy}")
+
+        self.policy = policy
+        self.probe_concurrency = probe_concurrency
+        self.probe_wait = probe_wait
+        self.probe_deadline = None
+        self.heap = []
+        self.sequence = itertools.count()
+        self.source_info = {}
+        self.probes = set()
+        self.probe_semaphore = None
+        self.changed = None
+        self.active = 0
+        self.total = 0
+        self.closed = False
+        self.initial_files = list(input_files)
+
+    def start(self):
+        self.changed = asyncio.Event()
+        self.probe_semaphore = asyncio.Semaphore(self.probe_concurrency)
+        for input_file in self.initial_files:
+            self.add(input_file)
+        self.initial_files = []
+
+    def add(self, input_file):
+        if self.closed:
+            return False
+        if self.changed is None:
+            self.initial_files.append(input_file)
+            return True
+
+        index = next(self.sequence)
+        self.total += 1
+
+        if self.policy == 'fifo':
+            self.push(index, input_file)
+        else:
+            probe = asyncio.ensure_future(self.probe(index, input_file))
+            self.probes.add(probe)
+            probe.add_done_callback(self.probes.discard)
+        return True
+
+    async def probe(self, index, input_file):
+        try:
+            async with self.probe_semaphore:
+                self.source_info[input_file] = await probe_source(input_file)
+        finally:
+            self.push(index, input_file)
+
+    def push(self, index, input_file):
+        cost = estimate_cost(self.source_info.get(input_file))
+        if self.policy == 'sjf':
+            key = (cost, index)
+        elif self.policy == 'lpt':
+            key = (-cost, index)
+        else:
+            key = (index,)
+
+        heapq.heappush(self.heap, (key, index, input_file))
+        self.changed.set()
+
+    def ready(self):
+        if not self.probes:
+            self.probe_deadline = None
+            return True
+
+        if self.probe_deadline is None:
+            self.probe_deadline = time.monotonic() + self.probe_wait
+        return time.monotonic() >= self.probe_deadline
+
+    async def get(self):
+        while True:
+            if self.heap and self.ready():
+                _, index, input_file = heapq.heappop(self.heap)
+                self.active += 1
+                return index, input_file
+
+            if not self.heap and not self.probes and self.active == 0:
+                self.closed = True
+                self.changed.set()
+                return None
+
+            timeout = None
+            if self.heap:
+                timeout = max(0, self.probe_deadline - time.monotonic())
+
+            self.changed.clear()
+            try:
+                await asyncio.wait_for(self.changed.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def task_done(self):
+        self.active -= 1
+        self.changed.set()
+
+    def cancel(self):
+        self.closed = True
+        for probe in list(self.probes):
+            probe.cancel()
+
+def get_cache_dir():
+    if sys.platform == 'win32':
+        base_path = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base_path = os.path.expanduser('~/Library/Caches')
+    else:
+        base_path = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+
+    return Path(base_path) / 'Advanced AMV Converter'
+
+class ThumbnailCache:
+    def __init__(self, directory=None, max_bytes=64 * 1024 * 1024):
+        self.directory = Path(directory) if directory else get_cache_dir() / 'thumbnails'
+        self.max_bytes = max_bytes
+        self.total_size = None
+        self.lock = threading.Lock()
+
+    def key(self, input_file, width):
+        try:
+            stat = os.stat(input_file)
+        except OSError:
+            return None
+
+        identity = f"{os.path.abspath(input_file)}|{stat.st_size}|{stat.st_mtime_ns}|{width}"
+        return hashlib.sha1(identity.encode('utf-8', errors='replace')).hexdigest()
+
+    def paths(self, key):
+        return self.directory / f"{key}.jpg", self.directory / f"{key}.json"
+
+    def get(self, key):
+        image_path, info_path = self.paths(key)
+        try:
+            info = json.loads(info_path.read_text())
+        except (OSError, ValueError):
+            return None
+
+        if not image_path.exists():
+            image_path = None
+        else:
+            try:
+                os.utime(info_path)
+            except OSError:
+                pass
+        return image_path, info
+
+    def put(self, key, image_file, info):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        image_path, info_path = self.paths(key)
+
+        added = 0
+        if image_file and Path(image_file).exists():
+            os.replace(image_file, image_path)
+            added += image_path.stat().st_size
+        else:
+            image_path = None
+
+        info_path.write_text(json.dumps(info))
+        added += info_path.stat().st_size
+
+        with self.lock:
+            if self.total_size is None:
+                self.total_size = self.scan_size()
+            else:
+                self.total_size += added
+            if self.total_size > self.max_bytes:
+                self.trim()
+
+        return image_path
+
+    def scan_size(self):
+        try:
+            return sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+        except OSError:
+            return 0
+
+    def trim(self):
+        entries = {}
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.is_file():
+                    stem = entry.name.split('.', 1)[0]
+                    size, mtime = entries.get(stem, (0, 0))
+                    stat = entry.stat()
+                    entries[stem] = (size + stat.st_size, max(mtime, stat.st_mtime))
+        except OSError:
+            return
+
+        self.total_size = sum(size for size, _ in entries.values())
+        target = self.max_bytes * 0.9
+        for stem, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if self.total_size <= target:
+                break
+            for path in self.paths(stem):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+            self.total_size -= size
+
+async def extract_thumbnail(input_file, output_file, timestamp=0, width=96, timeout=15):
+    cmd = [
+        FFMPEG_PATH, '-v', 'error', '-noaccurate_seek', '-ss', f"{timestamp:.3f}",
+        '-skip_frame', 'nokey', '-i', str(input_file),
+        '-frames:v', '1', '-an',
+        '-vf', f'scale={width}:-2',
+        '-q:v', '5',
+        '-y',
+        str(output_file)
+    ]
+
+    await asyncio.wait_for(_run_ffmpeg(cmd, input_file), timeout)
+    return output_file
+
+async def load_thumbnail(input_file, cache=None, width=96):
+    cache = cache or ThumbnailCache()
+    key = cache.key(input_file, width)
+    if key is None:
+        return None, {}
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    source = await probe_source(input_file)
+    info = {'duration': source['duration'], 'width': source['width'], 'height': source['height']}
+    if info['duration'] <= 0 and not (info['width'] and info['height']):
+        return None, info
+
+    cache.directory.mkdir(parents=True, exist_ok=True)
+    temp_file = cache.directory / f"{key}.tmp.jpg"
+    try:
+        await extract_thumbnail(input_file, temp_file, source['duration'] * 0.1, width)
+    except (ConversionError, asyncio.TimeoutError, OSError):
+        temp_file.unlink(missing_ok=True)
+        return None, info
+
+    image_path = cache.put(key, temp_file, info)
+    return image_path, info
+
+async def run_many(job, input_files, concurrency=1, timeout=None, policy='fifo'):
+    queue = input_files if isinstance(input_files, JobQueue) else JobQueue(input_files, policy)
+    queue.start()
+    events = asyncio.Queue()
+
+    async def worker():
+        while True:
+            job_entry = await queue.get()
+            if job_entry is None:
+                break
+
+            index, input_file = job_entry
+            source = queue.source_info.get(input_file)
+            task = asyncio.ensure_future(job(input_file, events.put_nowait, index, source))
+            try:
+                try:
+                    done, _ = await asyncio.wait([task], timeout=timeout)
+                finally:
+                    if not task.done():
+                        task.cancel()
+                        await asyncio.gather(task, return_exceptions=True)
+
+                if done:
+                    task.result()
+                else:
+                    events.put_nowait(ConversionEvent(ConversionEvent.FAILED, input_file, index=index,
+                                                      error=TimeoutError(f"Timed out after {timeout}s")))
+            except asyncio.CancelledError:
+                events.put_nowait(ConversionEvent(ConversionEvent.CANCELLED, input_file, index=index))
+                raise
+            except Exception as e:
+                events.put_nowait(ConversionEvent(ConversionEvent.FAILED, input_file, index=index, error=e))
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    done = asyncio.gather(*workers)
+
+    try:
+        while True:
+            if events.empty() and done.done():
+                break
+
+            getter = asyncio.ensure_future(events.get())
+            await asyncio.wait([getter, done], return_when=asyncio.FIRST_COMPLETED)
+
+            if getter.done():
+                yield getter.result()
+            else:
+                getter.cancel()
+
+        await done
+    finally:
+        queue.cancel()
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+def convert_many(input_files, profile, concurrency=1, timeout=None, policy='fifo'):
+    async def job(input_file, on_event, index, source):
+        return await _convert(input_file, profile, on_event, index, source)
+
+    return run_many(job, input_files, concurrency, timeout, policy)
+
+def remove_black_bars_many(input_files, concurrency=1, timeout=None, policy='fifo', fast_decode=False,
+                           crop_mode='reencode'):
+    async def job(input_file, on_event, index, source):
+        return await _remove_black_bars(input_file, on_event, index, fast_decode, crop_mode, source)
+
+    return run_many(job, input_files, concurrency, timeout, policy)
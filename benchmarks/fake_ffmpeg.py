@@ -0,0 +1,179 @@
+import os
+import sys
+import json
+import time
+import random
+import zlib
+
+def env_float(name, default):
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+DURATION = env_float('FAKE_FFMPEG_DURATION', 60)
+UPDATES = int(env_float('FAKE_FFMPEG_UPDATES', 10))
+INTERVAL = env_float('FAKE_FFMPEG_INTERVAL', 0)
+FAIL_RATE = env_float('FAKE_FFMPEG_FAIL_RATE', 0)
+WIDTH = int(env_float('FAKE_FFMPEG_WIDTH', 1920))
+HEIGHT = int(env_float('FAKE_FFMPEG_HEIGHT', 1080))
+FPS = env_float('FAKE_FFMPEG_FPS', 24)
+CODEC = os.environ.get('FAKE_FFMPEG_CODEC', 'h264')
+CROP = os.environ.get('FAKE_FFMPEG_CROP', '1920:800:0:140')
+BSF_RESIZE = env_float('FAKE_FFMPEG_BSF_RESIZE', 1)
+LEGACY = env_float('FAKE_FFMPEG_LEGACY', 0)
+CODED_WIDTH = -(-WIDTH // 16) * 16
+CODED_HEIGHT = -(-HEIGHT // 16) * 16
+
+def input_file(args):
+    if '-i' in args:
+        index = args.index('-i')
+        if index + 1 < len(args):
+            return args[index + 1]
+    return args[-1] if args else ''
+
+def should_fail(args):
+    if FAIL_RATE <= 0:
+        return False
+    return random.Random(zlib.crc32(input_file(args).encode())).random() < FAIL_RATE
+
+def write(line):
+    sys.stderr.write(line + '\n')
+    sys.stderr.flush()
+
+def format_time(seconds):
+    hours, remainder = divmod(seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    return f"{int(hours):02d}:{int(minutes):02d}:{seconds:09.6f}"
+
+def option(args, name, default=None):
+    if name in args:
+        index = args.index(name)
+        if index + 1 < len(args):
+            return args[index + 1]
+    return default
+
+def probed_size(path):
+    try:
+        with open(path) as file:
+            width, height = file.read(32).split('x')
+        return int(width), int(height)
+    except (OSError, ValueError):
+        return WIDTH, HEIGHT
+
+def bitstream_crop_size(args):
+    width, height = CODED_WIDTH, CODED_HEIGHT
+    bsf = option(args, '-bsf:v', '')
+    if BSF_RESIZE and '=' in bsf:
+        for entry in bsf.split('=', 1)[1].split(':'):
+            name, value = entry.split('=')
+            if name in ('crop_left', 'crop_right'):
+                width -= int(value)
+            else:
+                height -= int(value)
+    return width, height
+
+def ffprobe(args):
+    if 'json' in args:
+        width, height = probed_size(args[-1])
+        print(json.dumps({
+            'streams': [{
+                'codec_name': CODEC,
+                'width': width,
+                'height': height,
+                'coded_width': CODED_WIDTH,
+                'coded_height': CODED_HEIGHT,
+                'pix_fmt': 'yuv420p',
+                'field_order': 'progressive',
+                'r_frame_rate': f"{int(FPS * 1000)}/1000"
+            }],
+            'format': {'duration': f"{DURATION:.6f}"}
+        }))
+    else:
+        print(f"{DURATION:.6f}")
+    return 0
+
+def cropdetect(args):
+    if should_fail(args):
+        write(f"{input_file(args)}: Invalid data found when processing input")
+        return 1
+    if LEGACY and 'cropdetect=skip=0' in args:
+        write("[Parsed_cropdetect_0 @ 0x55d5c8a4c2c0] Option 'skip' not found")
+        return 1
+
+    duration = min(float(option(args, '-t', DURATION)), DURATION)
+    frames = max(1, int(duration * FPS))
+    if '-frames:v' in args:
+        frames = min(frames, int(option(args, '-frames:v')))
+    width, height, x, y = (int(value) for value in CROP.split(':'))
+    step = max(1, frames // max(UPDATES, 1))
+
+    for frame in range(0, frames, step):
+        write(
+            f"[Parsed_cropdetect_0 @ 0x55d5c8a4c2c0] x1:{x} x2:{x + width - 1} y1:{y} y2:{y + height - 1} "
+            f"w:{width} h:{height} x:{x} y:{y} pts:{frame * 512} t:{frame / FPS:.6f} crop={CROP}"
+        )
+        if INTERVAL:
+            time.sleep(INTERVAL)
+
+    write(f"frame={frames:5d} fps=0.0 q=-0.0 Lsize=N/A time={format_time(duration)} bitrate=N/A speed=50x")
+    return 0
+
+def encode(args):
+    fps = float(option(args, '-r', FPS))
+    updates = max(UPDATES, 1)
+
+    write(f"Input #0, mov,mp4,m4a,3gp,3g2,mj2, from '{input_file(args)}':")
+    write(f"  Duration: {format_time(DURATION)[:-3]}, start: 0.000000, bitrate: 2500 kb/s")
+    write(f"  Stream #0:0(und): Video: {CODEC}, yuv420p, {WIDTH}x{HEIGHT}, {FPS:g} fps")
+
+    for update in range(1, updates + 1):
+        if INTERVAL:
+            time.sleep(INTERVAL)
+
+        out_time = DURATION * update / updates
+        frames = int(out_time * fps)
+        status = 'end' if update == updates else 'continue'
+        write(f"frame={frames}")
+        write(f"fps={fps * 10:.2f}")
+        write("stream_0_0_q=3.0")
+        write(f"bitrate={300.0:.1f}kbits/s")
+        write(f"total_size={int(out_time * 37500)}")
+        write(f"out_time_us={int(out_time * 1000000)}")
+        write(f"out_time_ms={int(out_time * 1000000)}")
+        write(f"out_time={format_time(out_time)}")
+        write("dup_frames=0")
+        write(f"drop_frames={int(out_time * max(FPS - fps, 0))}")
+        write("speed=10.0x")
+        write(f"progress={status}")
+
+    if should_fail(args):
+        write("Conversion failed!")
+        return 1
+
+    output_file = args[-1] if args else ''
+    if output_file and output_file not in ('-', 'pipe:1') and os.path.isdir(os.path.dirname(output_file) or '.'):
+        with open(output_file, 'w') as file:
+            if '-bsf:v' in args:
+                file.write('%dx%d' % bitstream_crop_size(args))
+    return 0
+
+def main(argv):
+    tool = argv[1] if len(argv) > 1 and argv[1] in ('ffmpeg', 'ffprobe') else 'ffmpeg'
+    args = argv[2:] if len(argv) > 1 and argv[1] in ('ffmpeg', 'ffprobe') else argv[1:]
+
+    if tool == 'ffprobe':
+        return ffprobe(args)
+    if '-version' in args:
+        print("ffmpeg version 6.1-fake Copyright (c) 2000-2023 the FFmpeg developers")
+        return 0
+    if '-encoders' in args:
+        print(" V..... amv                  AMV Video")
+        print(" A..... adpcm_ima_amv        ADPCM IMA AMV")
+        return 0
+    if any('cropdetect' in arg for arg in args):
+        return cropdetect(args)
+    return encode(args)
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv))
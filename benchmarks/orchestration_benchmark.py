@@ -0,0 +1,268 @@
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+import tempfile
+import subprocess
+import statistics
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+FAKE_FFMPEG = Path(__file__).resolve().parent / 'fake_ffmpeg.py'
+sys.path.insert(0, str(ROOT))
+
+import amv_core
+
+def install_fake_ffmpeg(directory):
+    paths = {}
+    for tool in ('ffmpeg', 'ffprobe'):
+        if sys.platform == 'win32':
+            launcher = Path(directory) / f'{tool}.bat'
+            launcher.write_text(f'@"{sys.executable}" "{FAKE_FFMPEG}" {tool} %*\r\n')
+        else:
+            launcher = Path(directory) / tool
+            launcher.write_text(
+                f'#!/bin/sh\nexec "{sys.executable}" "{FAKE_FFMPEG}" {tool} "$@"\n'
+            )
+            launcher.chmod(0o755)
+        paths[tool] = str(launcher)
+    return paths
+
+def configure_fake(args):
+    os.environ['FAKE_FFMPEG_DURATION'] = str(args.duration)
+    os.environ['FAKE_FFMPEG_UPDATES'] = str(args.updates)
+    os.environ['FAKE_FFMPEG_INTERVAL'] = str(args.interval)
+    os.environ['FAKE_FFMPEG_FAIL_RATE'] = str(args.fail_rate)
+
+def make_input_files(directory, count):
+    input_folder = Path(directory) / 'input'
+    input_folder.mkdir()
+    return [str(input_folder / f'clip_{index:05d}.mp4') for index in range(count)]
+
+def peak_memory_mb():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        pass
+
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+def baseline_commands(mode, input_file, output_folder):
+    output_file = str(Path(output_folder) / (Path(input_file).stem + '.amv'))
+    if mode == 'blackbar':
+        return [
+            [amv_core.FFMPEG_PATH, '-ss', '1', '-t', '5', '-i', input_file,
+             '-vf', 'cropdetect', '-an', '-f', 'null', '-'],
+            [amv_core.FFPROBE_PATH, '-v', 'quiet', '-of', 'json', input_file],
+            [amv_core.FFMPEG_PATH, '-i', input_file, '-c', 'copy',
+             '-bsf:v', 'h264_metadata=crop_top=140:crop_bottom=148', '-y', output_file],
+            [amv_core.FFPROBE_PATH, '-v', 'quiet', '-of', 'json', output_file]
+        ]
+
+    return [
+        [amv_core.FFPROBE_PATH, '-v', 'quiet', '-of', 'json', input_file],
+        amv_core.ConversionProfile().build_command(input_file, output_file)
+    ]
+
+def measure_baseline(mode, input_files, samples, output_folder):
+    samples = input_files[:samples]
+    if not samples:
+        return 0
+
+    started = time.perf_counter()
+    for input_file in samples:
+        for cmd in baseline_commands(mode, input_file, output_folder):
+            amv_core.run_subprocess_simple(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return (time.perf_counter() - started) / len(samples)
+
+def run_core(input_files, args):
+    counts = {'events': 0, 'failed': 0}
+
+    async def consume():
+        profile = amv_core.ConversionProfile()
+        async for event in amv_core.convert_many(input_files, profile, concurrency=args.concurrency):
+            counts['events'] += 1
+            if event.kind == amv_core.ConversionEvent.FAILED:
+                counts['failed'] += 1
+
+    started = time.perf_counter()
+    asyncio.run(consume())
+    wall = time.perf_counter() - started
+
+    return {
+        'wall': wall,
+        'signals': counts['events'],
+        'failed': counts['failed'],
+        'add_files': 0,
+        'log_lines': 0,
+        'loop_latency': []
+    }
+
+def run_gui(mode, input_files, args):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QEventLoop, QTimer
+    import AdvancedAMVConverter as gui
+
+    app = QApplication.instance() or QApplication([])
+    window = gui.AdvancedAMVConverter()
+
+    counts = {'signals': 0}
+    loop = QEventLoop()
+
+    def counted(slot):
+        def wrapper(*slot_args):
+            counts['signals'] += 1
+            return slot(*slot_args)
+        return wrapper
+
+    window.update_status = counted(window.update_status)
+    window.update_progress = counted(window.update_progress)
+    window.update_ffmpeg_progress = counted(window.update_ffmpeg_progress)
+
+    finished = window.conversion_finished
+    def conversion_finished(success, message):
+        counts['signals'] += 1
+        finished(success, message)
+        loop.quit()
+    window.conversion_finished = conversion_finished
+
+    started = time.perf_counter()
+    window.handle_dropped_files(input_files)
+    add_files = time.perf_counter() - started
+
+    latencies = []
+    tick = {'last': time.perf_counter()}
+    def on_tick():
+        now = time.perf_counter()
+        latencies.append(max(0, now - tick['last'] - args.tick / 1000))
+        tick['last'] = now
+
+    timer = QTimer()
+    timer.setInterval(args.tick)
+    timer.timeout.connect(on_tick)
+
+    started = time.perf_counter()
+    tick['last'] = started
+    timer.start()
+    if mode == 'blackbar':
+        window.start_blackbar_removal()
+    else:
+        window.start_conversion()
+    loop.exec()
+    timer.stop()
+    wall = time.perf_counter() - started
+
+    log_lines = window.log_text.document().blockCount()
+    window.close()
+
+    return {
+        'wall': wall,
+        'signals': counts['signals'],
+        'failed': None,
+        'add_files': add_files,
+        'log_lines': log_lines,
+        'loop_latency': latencies
+    }
+
+def report(mode, files, baseline, result):
+    wall = result['wall']
+    per_file = wall / files if files else 0
+    latencies = sorted(result['loop_latency'])
+
+    summary = {
+        'mode': mode,
+        'files': files,
+        'wall_s': round(wall, 3),
+        'per_file_ms': round(per_file * 1000, 3),
+        'fake_ffmpeg_per_file_ms': round(baseline * 1000, 3),
+        'overhead_per_file_ms': round((per_file - baseline) * 1000, 3),
+        'add_files_s': round(result['add_files'], 3),
+        'signals': result['signals'],
+        'signals_per_s': round(result['signals'] / wall, 1) if wall else 0,
+        'log_lines': result['log_lines'],
+        'peak_memory_mb': round(peak_memory_mb() or 0, 1),
+    }
+    if result['failed'] is not None:
+        summary['failed'] = result['failed']
+    if latencies:
+        summary['loop_latency_mean_ms'] = round(statistics.mean(latencies) * 1000, 3)
+        summary['loop_latency_p99_ms'] = round(latencies[int(len(latencies) * 0.99) - 1] * 1000, 3)
+        summary['loop_latency_max_ms'] = round(latencies[-1] * 1000, 3)
+
+    return summary
+
+def run_mode(mode, args):
+    with tempfile.TemporaryDirectory(prefix='amv_bench_') as directory:
+        paths = install_fake_ffmpeg(directory)
+        amv_core.FFMPEG_PATH = paths['ffmpeg']
+        amv_core.FFPROBE_PATH = paths['ffprobe']
+        calibration_folder = Path(directory) / 'calibration'
+        calibration_folder.mkdir()
+
+        input_files = make_input_files(directory, args.files)
+        baseline = measure_baseline(mode, input_files, args.calibrate, calibration_folder)
+        if mode == 'core':
+            result = run_core(input_files, args)
+            baseline /= max(args.concurrency, 1)
+        else:
+            result = run_gui(mode, input_files, args)
+
+    summary = report(mode, args.files, baseline, result)
+    print(f"[{mode}]")
+    for key, value in summary.items():
+        if key != 'mode':
+            print(f"  {key:<26}{value}", flush=True)
+    return summary
+
+def run_isolated(mode, args):
+    with tempfile.TemporaryDirectory(prefix='amv_bench_') as directory:
+        json_file = Path(directory) / 'result.json'
+        cmd = [
+            sys.executable, str(Path(__file__).resolve()), '--mode', mode,
+            '--files', str(args.files), '--duration', str(args.duration),
+            '--updates', str(args.updates), '--interval', str(args.interval),
+            '--fail-rate', str(args.fail_rate), '--concurrency', str(args.concurrency),
+            '--calibrate', str(args.calibrate), '--tick', str(args.tick),
+            '--json', str(json_file)
+        ]
+        subprocess.run(cmd, check=True)
+        return json.loads(json_file.read_text())[0]
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Measure the Python-side orchestration overhead of batch conversion "
+                    "using a fake ffmpeg/ffprobe in place of the real tools."
+    )
+    parser.add_argument('--mode', choices=('conversion', 'blackbar', 'core', 'all'), default='all')
+    parser.add_argument('--files', type=int, default=10000, help="number of files in the batch")
+    parser.add_argument('--duration', type=float, default=60, help="media duration reported by the fake, in seconds")
+    parser.add_argument('--updates', type=int, default=10, help="progress/cropdetect updates emitted per run")
+    parser.add_argument('--interval', type=float, default=0, help="delay between updates, in seconds")
+    parser.add_argument('--fail-rate', type=float, default=0, help="fraction of encodes and crop detections that fail")
+    parser.add_argument('--concurrency', type=int, default=1, help="concurrent jobs in core mode")
+    parser.add_argument('--calibrate', type=int, default=20, help="files used to time the fake alone")
+    parser.add_argument('--tick', type=int, default=10, help="event-loop latency probe interval, in ms")
+    parser.add_argument('--json', help="write the results to this file")
+    args = parser.parse_args()
+
+    if args.mode == 'all':
+        results = [run_isolated(mode, args) for mode in ('conversion', 'blackbar', 'core')]
+    else:
+        configure_fake(args)
+        results = [run_mode(args.mode, args)]
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2))
+
+if __name__ == '__main__':
+    main()
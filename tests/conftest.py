@@ -0,0 +1,47 @@
+import os
+import sys
+import asyncio
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / 'benchmarks'))
+
+import amv_core
+from orchestration_benchmark import install_fake_ffmpeg
+
+@pytest.fixture
+def fake_ffmpeg(tmp_path, monkeypatch):
+    for name in ('DURATION', 'UPDATES', 'INTERVAL', 'FAIL_RATE', 'BSF_RESIZE', 'LEGACY'):
+        monkeypatch.delenv(f'FAKE_FFMPEG_{name}', raising=False)
+
+    tools = tmp_path / 'tools'
+    tools.mkdir()
+    paths = install_fake_ffmpeg(tools)
+    monkeypatch.setattr(amv_core, 'FFMPEG_PATH', paths['ffmpeg'])
+    monkeypatch.setattr(amv_core, 'FFPROBE_PATH', paths['ffprobe'])
+
+    input_folder = tmp_path / 'input'
+    input_folder.mkdir()
+    input_files = []
+    for index in range(3):
+        input_file = input_folder / f'clip_{index}.mp4'
+        input_file.write_bytes(b'')
+        input_files.append(str(input_file))
+    return input_files
+
+@pytest.fixture
+def collect():
+    def collect(events):
+        async def consume():
+            return [event async for event in events]
+        return asyncio.run(consume())
+    return collect
+
+@pytest.fixture
+def qapp():
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    QtWidgets = pytest.importorskip('PyQt6.QtWidgets')
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
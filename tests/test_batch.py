@@ -0,0 +1,39 @@
+import asyncio
+
+import amv_core
+from amv_core import ConversionEvent, ConversionProfile, convert_many, remove_black_bars_many, run_many
+
+def test_convert_many_with_fake_ffmpeg(fake_ffmpeg, collect):
+    events = collect(convert_many(fake_ffmpeg, ConversionProfile()))
+
+    completed = [event for event in events if event.kind == ConversionEvent.COMPLETED]
+    assert [event.input_file for event in completed] == fake_ffmpeg
+    assert all(event.output_file.exists() for event in completed)
+    assert any(event.kind == ConversionEvent.PROGRESS for event in events)
+
+def test_convert_many_reports_failures_and_timeouts(fake_ffmpeg, collect, monkeypatch):
+    monkeypatch.setenv('FAKE_FFMPEG_FAIL_RATE', '1')
+    events = collect(convert_many(fake_ffmpeg, ConversionProfile()))
+    failed = [event for event in events if event.kind == ConversionEvent.FAILED]
+    assert len(failed) == len(fake_ffmpeg)
+    assert all(isinstance(event.error, amv_core.ConversionError) for event in failed)
+
+    monkeypatch.setenv('FAKE_FFMPEG_FAIL_RATE', '0')
+    monkeypatch.setenv('FAKE_FFMPEG_INTERVAL', '1')
+    events = collect(convert_many(fake_ffmpeg[:1], ConversionProfile(), timeout=0.5))
+    assert [str(event.error) for event in events if event.is_final] == ['Timed out after 0.5s']
+
+def test_run_many_keeps_inner_timeout_messages(collect):
+    async def job(input_file, on_event, index, source):
+        raise asyncio.TimeoutError("Crop detection timed out after 60s")
+
+    events = collect(run_many(job, ['a.mp4']))
+    assert [str(event.error) for event in events] == ['Crop detection timed out after 60s']
+
+def test_remove_black_bars_many_with_fake_ffmpeg(fake_ffmpeg, collect):
+    events = collect(remove_black_bars_many(fake_ffmpeg))
+
+    completed = [event for event in events if event.kind == ConversionEvent.COMPLETED]
+    assert len(completed) == len(fake_ffmpeg)
+    assert {event.crop for event in completed} == {'1920:800:0:140'}
+    assert all(event.output_file.parent.name == 'Cropped' for event in completed)
@@ -0,0 +1,50 @@
+import pytest
+
+from amv_core import ConversionEvent, build_bitstream_crop, remove_black_bars_many
+
+H264_SOURCE = {
+    'codec': 'h264', 'width': 1920, 'height': 1080, 'coded_width': 1920, 'coded_height': 1088,
+    'pix_fmt': 'yuv420p', 'field_order': 'progressive', 'rotation': 0, 'fps': 24, 'duration': 60
+}
+
+def test_bitstream_crop_aligns_to_coded_size():
+    assert build_bitstream_crop(H264_SOURCE, '1920:800:0:140') == [
+        '-c', 'copy', '-bsf:v', 'h264_metadata=crop_left=0:crop_right=0:crop_top=140:crop_bottom=148'
+    ]
+
+def test_bitstream_crop_rejects_unsupported_sources():
+    assert build_bitstream_crop(H264_SOURCE, '1920:799:0:141') is None
+    assert build_bitstream_crop(dict(H264_SOURCE, codec='mpeg4'), '1920:800:0:140') is None
+    assert build_bitstream_crop(dict(H264_SOURCE, rotation=90), '1920:800:0:140') is None
+    assert build_bitstream_crop(dict(H264_SOURCE, pix_fmt=''), '1920:800:0:140') is None
+
+@pytest.mark.parametrize('resize, method', [('1', 'bitstream'), ('0', 'reencode')])
+def test_remove_black_bars_many_with_fake_ffmpeg(fake_ffmpeg, collect, monkeypatch, resize, method):
+    monkeypatch.setenv('FAKE_FFMPEG_BSF_RESIZE', resize)
+    events = collect(remove_black_bars_many(fake_ffmpeg, crop_mode='auto'))
+
+    completed = [event for event in events if event.kind == ConversionEvent.COMPLETED]
+    assert len(completed) == len(fake_ffmpeg)
+    assert {event.method for event in completed} == {method}
+    assert {event.crop for event in completed} == {'1920:800:0:140'}
+
+def test_hevc_bitstream_crop():
+    source = dict(H264_SOURCE, codec='hevc', coded_height=1080)
+    assert build_bitstream_crop(source, '1920:800:0:140') == [
+        '-c', 'copy', '-bsf:v', 'hevc_metadata=crop_left=0:crop_right=0:crop_top=140:crop_bottom=140'
+    ]
+
+def test_lossless_crop_option_fits_the_settings_tab(qapp):
+    import AdvancedAMVConverter as gui
+
+    window = gui.AdvancedAMVConverter()
+    window.show()
+    window.tab_widget.setCurrentIndex(window.SETTINGS_TAB)
+    qapp.processEvents()
+
+    settings_tab = window.tab_widget.currentWidget()
+    assert settings_tab.isAncestorOf(window.lossless_crop_check)
+    hint = settings_tab.minimumSizeHint()
+    assert hint.width() <= settings_tab.width() and hint.height() <= settings_tab.height()
+    assert window.lossless_crop_check.isChecked()
+    window.close()
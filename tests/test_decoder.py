@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from amv_core import ConversionError, ConversionEvent, build_decoder_args, detect_crop, remove_black_bars_many
+
+H264_SOURCE = {
+    'codec': 'h264', 'width': 1920, 'height': 1080, 'coded_width': 1920, 'coded_height': 1088,
+    'pix_fmt': 'yuv420p', 'field_order': 'progressive', 'rotation': 0, 'fps': 24, 'duration': 60
+}
+
+def test_decoder_args():
+    assert build_decoder_args(H264_SOURCE, '240') == (['-skip_loop_filter', 'nonref', '-flags2', '+fast'], 0)
+    assert build_decoder_args(dict(H264_SOURCE, codec='vp9'), '240') == (['-skip_loop_filter', 'nonref'], 0)
+    assert build_decoder_args(dict(H264_SOURCE, codec='mpeg4'), '240') == (['-lowres', '1'], 1)
+    assert build_decoder_args(dict(H264_SOURCE, codec='mpeg4'), '240', allow_lowres=False) == ([], 0)
+    assert build_decoder_args(None, '240') == ([], 0)
+
+def test_fast_crop_detection(fake_ffmpeg):
+    assert asyncio.run(detect_crop(fake_ffmpeg[0], fast=True)) == '1920:800:0:140'
+
+def test_crop_detection_raises_on_ffmpeg_errors(fake_ffmpeg, monkeypatch):
+    monkeypatch.setenv('FAKE_FFMPEG_LEGACY', '1')
+    with pytest.raises(ConversionError):
+        asyncio.run(detect_crop(fake_ffmpeg[0], fast=True))
+
+    monkeypatch.setenv('FAKE_FFMPEG_FAIL_RATE', '1')
+    with pytest.raises(ConversionError):
+        asyncio.run(detect_crop(fake_ffmpeg[0]))
+
+def test_fast_black_bar_removal_falls_back_without_cropdetect_skip(fake_ffmpeg, collect, monkeypatch):
+    monkeypatch.setenv('FAKE_FFMPEG_LEGACY', '1')
+    events = collect(remove_black_bars_many(fake_ffmpeg, fast_decode=True))
+    assert [event.crop for event in events if event.kind == ConversionEvent.COMPLETED] == ['1920:800:0:140'] * 3
+
+def test_unreadable_files_fail_instead_of_reporting_no_crop(fake_ffmpeg, collect, monkeypatch):
+    monkeypatch.setenv('FAKE_FFMPEG_FAIL_RATE', '1')
+    events = collect(remove_black_bars_many(fake_ffmpeg, fast_decode=True))
+    assert [event.kind for event in events if event.is_final] == [ConversionEvent.FAILED] * 3
@@ -0,0 +1,19 @@
+from amv_core import ConversionProfile, build_filter_graph
+
+def test_filter_graph_puts_fps_first_and_merges_crop():
+    source = {'width': 1920, 'height': 1080, 'fps': 60}
+    assert build_filter_graph('240', 'Crop', 15, source=source) == 'fps=15,crop=1440:1080:240:0,scale=320:240'
+    assert (build_filter_graph('240', 'Preserved', 15, '1920:800:0:140', {'width': 1920, 'height': 1080, 'fps': 24})
+            == 'fps=15,crop=1920:800:0:140,scale=576:240')
+
+def test_filter_graph_skips_no_op_steps():
+    assert build_filter_graph('240', 'Preserved', 30, source={'width': 320, 'height': 240, 'fps': 30}) == 'null'
+    assert build_filter_graph('240', 'Preserved', 15) == 'fps=15,scale=-2:240'
+
+def test_filter_graph_forced_and_expression_fallback():
+    assert build_filter_graph('240', 'Forced', 15, source={'width': 1280, 'height': 720, 'fps': 30}) == 'fps=15,scale=320:240'
+    assert (build_filter_graph('240', 'Crop', 15)
+            == "fps=15,crop='min(iw,ih*320/240)':'min(ih,iw*240/320)',scale=320:240")
+
+def test_profile_skips_fps_filter_for_low_frame_rate_sources():
+    assert ConversionProfile().video_filter(source={'width': 1280, 'height': 720, 'fps': 10}) == 'scale=426:240'
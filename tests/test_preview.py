@@ -0,0 +1,52 @@
+import time
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from amv_core import ConversionProfile, ConversionError, preview
+
+def test_preview_clamps_start_to_duration(fake_ffmpeg, tmp_path):
+    result = asyncio.run(preview(fake_ffmpeg[0], ConversionProfile(), start=100, output_dir=tmp_path / 'preview'))
+
+    assert result.start == 57
+    assert result.output_file.exists()
+    assert result.strip_file.exists()
+    assert result.output_file.parent == tmp_path / 'preview'
+
+def test_preview_reports_ffmpeg_failures(fake_ffmpeg, tmp_path, monkeypatch):
+    monkeypatch.setenv('FAKE_FFMPEG_FAIL_RATE', '1')
+    with pytest.raises(ConversionError):
+        asyncio.run(preview(fake_ffmpeg[0], ConversionProfile(), output_dir=tmp_path / 'preview'))
+
+def run_dialog_preview(qapp, dialog):
+    dialog.run_preview()
+    dialog.preview_worker.wait()
+    qapp.processEvents()
+
+def test_preview_dialog_removes_folders_of_failed_previews(qapp, fake_ffmpeg, monkeypatch):
+    import AdvancedAMVConverter as gui
+
+    dialog = gui.PreviewDialog(fake_ffmpeg[0], ConversionProfile(), "240p")
+    run_dialog_preview(qapp, dialog)
+    monkeypatch.setenv('FAKE_FFMPEG_FAIL_RATE', '1')
+    run_dialog_preview(qapp, dialog)
+    assert dialog.result_label.text().startswith("❌ Preview failed")
+
+    output_dirs = list(dialog.output_dirs)
+    assert len(output_dirs) == 2 and all(Path(output_dir).is_dir() for output_dir in output_dirs)
+    dialog.done(0)
+    assert not any(Path(output_dir).exists() for output_dir in output_dirs)
+
+def test_closing_preview_dialog_cancels_running_preview(qapp, fake_ffmpeg, monkeypatch):
+    import AdvancedAMVConverter as gui
+
+    monkeypatch.setenv('FAKE_FFMPEG_INTERVAL', '1')
+    dialog = gui.PreviewDialog(fake_ffmpeg[0], ConversionProfile(), "240p")
+    dialog.run_preview()
+    time.sleep(0.5)
+
+    started = time.perf_counter()
+    dialog.done(0)
+    assert time.perf_counter() - started < 2
+    assert not dialog.preview_worker.isRunning()
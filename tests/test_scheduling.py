@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+import amv_core
+from amv_core import ConversionEvent, ConversionProfile, JobQueue, convert_many, estimate_cost
+
+def test_estimate_cost():
+    assert estimate_cost(None) == float('inf')
+    assert estimate_cost({'duration': 0}) == float('inf')
+    assert estimate_cost({'duration': 10, 'width': 1280, 'height': 720}) == 10
+    assert estimate_cost({'duration': 10, 'width': 2560, 'height': 1440}) == 40
+    assert estimate_cost({'duration': 10, 'width': 0, 'height': 0}) == 10
+
+@pytest.mark.parametrize('policy, expected', [
+    ('fifo', ['a', 'b', 'c', 'd']),
+    ('sjf', ['c', 'a', 'b', 'd']),
+    ('lpt', ['d', 'b', 'a', 'c']),
+])
+def test_job_queue_order(monkeypatch, policy, expected):
+    durations = {'a': 20, 'b': 30, 'c': 10, 'd': 0}
+
+    async def probe_source(input_file, timeout=30):
+        return {'duration': durations[input_file], 'width': 1280, 'height': 720}
+
+    monkeypatch.setattr(amv_core, 'probe_source', probe_source)
+
+    async def drain():
+        queue = JobQueue(['a', 'b', 'c', 'd'], policy)
+        queue.start()
+        order = []
+        while True:
+            entry = await queue.get()
+            if entry is None:
+                return order
+            order.append(entry[1])
+            queue.task_done()
+
+    assert asyncio.run(drain()) == expected
+
+def test_job_queue_rejects_unknown_policy():
+    with pytest.raises(ValueError):
+        JobQueue(policy='random')
+
+def test_convert_many_accepts_files_added_while_running(fake_ffmpeg, tmp_path):
+    extra_file = tmp_path / 'input' / 'extra.mp4'
+    extra_file.write_bytes(b'')
+    queue = JobQueue(fake_ffmpeg[:1])
+
+    async def consume():
+        completed = []
+        async for event in convert_many(queue, ConversionProfile()):
+            if event.kind == ConversionEvent.STARTED and not completed:
+                assert queue.add(str(extra_file))
+            if event.kind == ConversionEvent.COMPLETED:
+                completed.append(event.input_file)
+        return completed
+
+    assert asyncio.run(consume()) == [fake_ffmpeg[0], str(extra_file)]
+    assert queue.closed and not queue.add(str(extra_file))
+
+def test_worker_reports_only_files_actually_queued(qapp):
+    import AdvancedAMVConverter as gui
+
+    worker = gui.ConversionWorker([], ConversionProfile())
+    messages = []
+    worker.status_updated.connect(messages.append)
+
+    worker.queue = JobQueue()
+    worker.queue.closed = True
+    worker.queue_files(['a.mp4'])
+    assert messages == []
+
+    worker.queue = JobQueue()
+    worker.queue_files(['a.mp4', 'b.mp4'])
+    assert messages == ["Queued 2 file(s) on the running batch"]
@@ -0,0 +1,47 @@
+import os
+import asyncio
+
+import amv_core
+from amv_core import ThumbnailCache, load_thumbnail
+
+def test_thumbnail_cache_trims_oldest_entries(tmp_path):
+    cache = ThumbnailCache(tmp_path / 'cache', max_bytes=3000)
+
+    for index in range(5):
+        image_file = tmp_path / f'{index}.jpg'
+        image_file.write_bytes(b'x' * 900)
+        cache.put(f'key{index}', image_file, {'duration': index})
+        stamp = 1000000000 + index
+        for path in cache.paths(f'key{index}'):
+            os.utime(path, (stamp, stamp))
+
+    assert cache.total_size <= cache.max_bytes
+    assert cache.get('key0') is None
+    assert cache.get('key4') == (cache.paths('key4')[0], {'duration': 4})
+
+def cached_files(cache):
+    return sorted(os.listdir(cache.directory)) if cache.directory.exists() else []
+
+def test_load_thumbnail_caches_successful_results(fake_ffmpeg, tmp_path):
+    cache = ThumbnailCache(tmp_path / 'cache')
+    image_path, info = asyncio.run(load_thumbnail(fake_ffmpeg[0], cache))
+
+    assert image_path.exists()
+    assert info == {'duration': 60, 'width': 1920, 'height': 1080}
+    assert len(cached_files(cache)) == 2
+    assert asyncio.run(load_thumbnail(fake_ffmpeg[0], cache)) == (image_path, info)
+
+def test_load_thumbnail_does_not_cache_failed_probes(fake_ffmpeg, tmp_path, monkeypatch):
+    monkeypatch.setattr(amv_core, 'FFPROBE_PATH', str(tmp_path / 'missing-ffprobe'))
+    cache = ThumbnailCache(tmp_path / 'cache')
+
+    assert asyncio.run(load_thumbnail(fake_ffmpeg[0], cache)) == (None, {'duration': 0, 'width': 0, 'height': 0})
+    assert cached_files(cache) == []
+
+def test_load_thumbnail_does_not_cache_failed_extractions(fake_ffmpeg, tmp_path, monkeypatch):
+    monkeypatch.setenv('FAKE_FFMPEG_FAIL_RATE', '1')
+    cache = ThumbnailCache(tmp_path / 'cache')
+
+    image_path, info = asyncio.run(load_thumbnail(fake_ffmpeg[0], cache))
+    assert image_path is None and info['duration'] == 60
+    assert cached_files(cache) == []